@@ -0,0 +1,238 @@
+from concurrent.futures import ProcessPoolExecutor
+from mappings.software import flushDatabases
+from mappings import Software
+from grapher import Grapher
+import pandas as pd
+import miiPlaza
+import export
+import itertools
+import argparse
+import glob
+import sys
+import os
+
+
+def getSaveFiles(pattern: str) -> list:
+    """
+    Get the savefiles from a directory or a glob pattern.
+
+    If a directory is given, all the .dat files
+    inside it (recursively) are used.
+
+    Args:
+        - pattern (str): A directory or a glob pattern
+
+    Returns:
+        - list: Sorted list of paths to the savefiles
+    """
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "**", "*.dat")
+
+    return sorted(
+        path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path)
+    )
+
+
+def getChartsDirectory(filePath: str, directory: str) -> str:
+    """
+    Get the directory where the charts of a savefile are saved.
+
+    It is named after the path of the savefile, so
+    savefiles with the same name don't overwrite each other.
+
+    Args:
+        - filePath (str): The path to the meet.dat file
+        - directory (str): The directory of all the charts
+
+    Returns:
+        - str: The directory of the charts of the savefile
+    """
+    name = os.path.splitext(os.path.normpath(filePath))[0]
+    name = name.replace(":", "").strip(os.sep).replace(os.sep, "_")
+    return os.path.join(directory, name)
+
+
+def decodeSave(
+    filePath: str, chartsDirectory: str = None, chartsFormat: str = "png"
+) -> tuple:
+    """
+    Decode the Miis of a single savefile.
+
+    This runs in the worker processes, so it only
+    returns DataFrames, which can be pickled.
+    The pie charts are rendered from the same Mii data,
+    so the savefile is only decoded once.
+
+    Args:
+        - filePath (str): The path to the meet.dat file
+        - chartsDirectory (str): Where the pie charts are saved, if any
+        - chartsFormat (str): The format of the charts, like "png" or "svg"
+
+    Returns:
+        - tuple: The Mii data, the unknown bytes, the unknown bits
+            and the assumption violations DataFrames
+    """
+    with miiPlaza.MiiPlaza.fromPath(filePath, lazy=True) as plaza:
+        tables = (
+            plaza.getMiiTable().getData(),
+            plaza.getMiiUnknownBytes(),
+            plaza.getMiiUnknownBits(),
+            plaza.getAssumptionViolations(),
+        )
+
+    if chartsDirectory:
+        Grapher().renderPieCharts(
+            tables[0],
+            miiPlaza.MiiPlaza.PIE_CHART_COLUMNS,
+            getChartsDirectory(filePath, chartsDirectory),
+            chartsFormat,
+        )
+
+    for table in tables:
+        table.insert(0, "File", filePath)
+
+    # The worker processes of a pool don't run atexit,
+    # so the games found lazily are written here
+    flushDatabases()
+
+    return tables
+
+
+def setOffline(offline: bool) -> None:
+    """
+    Set whether the software is resolved without the network.
+
+    It is run at the start of each worker process.
+
+    Args:
+        - offline (bool): Whether to use offline mode
+
+    Returns:
+        - None
+    """
+    Software.offline = offline
+
+
+def decodeSaves(
+    filePaths: list,
+    maxWorkers: int = None,
+    offline: bool = False,
+    chartsDirectory: str = None,
+    chartsFormat: str = "png",
+) -> tuple:
+    """
+    Decode many savefiles in parallel and merge their Miis.
+
+    Each savefile is decoded in its own process and
+    every row is tagged with the file it comes from.
+
+    Args:
+        - filePaths (list): The paths to the meet.dat files
+        - maxWorkers (int): Number of processes, by default one per core
+        - offline (bool): Whether to resolve the software without the network
+        - chartsDirectory (str): Where the pie charts are saved, if any
+        - chartsFormat (str): The format of the charts, like "png" or "svg"
+
+    Returns:
+        - tuple: The merged Mii data, unknown bytes, unknown bits
+            and assumption violations DataFrames
+    """
+    with ProcessPoolExecutor(
+        max_workers=maxWorkers, initializer=setOffline, initargs=(offline,)
+    ) as executor:
+        results = list(
+            executor.map(
+                decodeSave,
+                filePaths,
+                itertools.repeat(chartsDirectory),
+                itertools.repeat(chartsFormat),
+            )
+        )
+
+    if not results:
+        return pd.DataFrame(), pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
+
+    return tuple(pd.concat(tables, ignore_index=True) for tables in zip(*results))
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(
+        description="Decode many meet.dat files in parallel"
+    )
+    parser.add_argument("saves", help="Directory or glob pattern of the savefiles")
+    parser.add_argument("-o", "--output", default=".", help="Output directory")
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parser.add_argument(
+        "--offline", action="store_true", help="Don't search games online"
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=["csv", *export.FORMATS],
+        default="csv",
+        help="Format of the output files",
+    )
+    parser.add_argument(
+        "-c",
+        "--charts",
+        choices=["png", "svg"],
+        default=None,
+        help="Also save the pie charts of each savefile in this format",
+    )
+    args = parser.parse_args()
+
+    filePaths = getSaveFiles(args.saves)
+    if not filePaths:
+        sys.exit(f"No savefiles found in {args.saves}")
+
+    miiData, unknownBytes, unknownBits, violations = decodeSaves(
+        filePaths,
+        args.workers,
+        args.offline,
+        os.path.join(args.output, "charts") if args.charts else None,
+        args.charts,
+    )
+
+    if args.format != "csv":
+        export.writeTables(
+            miiData, unknownBytes, unknownBits, args.output, args.format, violations
+        )
+    else:
+        os.makedirs(args.output, exist_ok=True)
+
+        with open(
+            os.path.join(args.output, "miis.csv"), "w", encoding="utf-8", newline=""
+        ) as f:
+            miiData.to_csv(f, index=False)
+
+        with open(
+            os.path.join(args.output, "miisUnknownBytes.csv"),
+            "w",
+            encoding="utf-8",
+            newline="",
+        ) as f:
+            unknownBytes.to_csv(f, index=False)
+
+        with open(
+            os.path.join(args.output, "miisUnknownBits.csv"),
+            "w",
+            encoding="utf-8",
+            newline="",
+        ) as f:
+            unknownBits.to_csv(f, index=False)
+
+        with open(
+            os.path.join(args.output, "miisAssumptionViolations.csv"),
+            "w",
+            encoding="utf-8",
+            newline="",
+        ) as f:
+            violations.to_csv(f, index=False)
+
+    if not violations.empty:
+        print(
+            f"{len(violations)} bits that should be empty are set "
+            f"in {violations['File'].nunique()} savefiles. "
+            "Please report this as an issue to the repository."
+        )
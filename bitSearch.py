@@ -0,0 +1,87 @@
+import pandas as pd
+import numpy as np
+
+
+def searchBits(
+    bits: np.ndarray, positions: np.ndarray, classes: np.ndarray, widths: list
+) -> dict:
+    """
+    Find the groups of consecutive bits that could store a characteristic.
+
+    A group of nBits consecutive bits is possible if all the Miis
+    of each class have the same value in those bits
+    and each class has a different value.
+
+    All the groups of all the widths are checked at once:
+        - A column is consistent if its minimum and maximum
+        are the same inside every class, so a group is consistent
+        if it has no inconsistent columns.
+        - The value of each class in every group is built
+        one bit at a time, so each width reuses the previous one.
+
+    Args:
+        - bits (np.ndarray): Matrix of 0s and 1s with one row per Mii
+            and one column per bit
+        - positions (np.ndarray): The position of the bit of each column
+        - classes (np.ndarray): The value of the characteristic of each Mii
+        - widths (list): The numbers of bits to find, at most 64
+
+    Returns:
+        - dict: The widths as keys and the lists of possible bits as values
+    """
+    widths = sorted(set(widths))
+    assert all(0 < nBits <= 64 for nBits in widths), "Widths must be between 1 and 64"
+
+    bits = np.asarray(bits, dtype=np.uint8)
+    positions = np.asarray(positions)
+    nColumns = len(positions)
+
+    codes, _ = pd.factorize(pd.Series(classes))
+
+    if len(codes):
+        # Group the Miis by class keeping their order
+        order = np.argsort(codes, kind="stable")
+        sortedBits = bits[order]
+        sortedCodes = codes[order]
+        starts = np.flatnonzero(np.r_[True, sortedCodes[1:] != sortedCodes[:-1]])
+
+        minimum = np.minimum.reduceat(sortedBits, starts, axis=0)
+        maximum = np.maximum.reduceat(sortedBits, starts, axis=0)
+        inconsistent = (minimum != maximum).any(axis=0)
+        first = sortedBits[starts].astype(np.uint64)
+
+    else:
+        inconsistent = np.zeros(nColumns, dtype=bool)
+        first = np.zeros((0, nColumns), dtype=np.uint64)
+
+    # Number of inconsistent columns before each column
+    inconsistentBefore = np.concatenate([[0], np.cumsum(inconsistent)])
+
+    values = np.zeros_like(first)
+    possibleBits = {nBits: [] for nBits in widths}
+
+    for nBits in range(1, widths[-1] + 1):
+        nWindows = nColumns - nBits + 1
+        if nWindows <= 0:
+            break
+
+        # Add the next bit to the value of every class in every group
+        values = values[:, :nWindows] | (
+            first[:, nBits - 1 : nBits - 1 + nWindows] << np.uint64(nBits - 1)
+        )
+
+        if nBits not in possibleBits:
+            continue
+
+        # The bits must be next to each other
+        together = positions[nBits - 1 :] - positions[:nWindows] == nBits - 1
+
+        consistent = (inconsistentBefore[nBits:] - inconsistentBefore[:nWindows]) == 0
+
+        sortedValues = np.sort(values, axis=0)
+        unique = (np.diff(sortedValues, axis=0) != 0).all(axis=0)
+
+        for start in np.flatnonzero(together & consistent & unique):
+            possibleBits[nBits].append(positions[start : start + nBits].tolist())
+
+    return possibleBits
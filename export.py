@@ -0,0 +1,229 @@
+import pyarrow.parquet as pq
+import pyarrow.feather as feather
+import pyarrow as pa
+import pandas as pd
+import numpy as np
+import json
+import os
+
+# Columns with few different values, stored as dictionaries
+CATEGORICAL_COLUMNS = [
+    "File",
+    "Creator",
+    "GameID",
+    "GameName",
+    "Country",
+    "Subregion",
+    "PreferredPet",
+    "Outfit",
+    "Dream",
+    "Hobby",
+]
+
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+
+def toCategorical(
+    data: pd.DataFrame, columns: list = CATEGORICAL_COLUMNS
+) -> pd.DataFrame:
+    """
+    Convert the columns with few different values to categoricals
+
+    Each value is stored only once and the rows
+    only keep a small integer code, so the files
+    are smaller and faster to read.
+
+    Args:
+        - data (pd.DataFrame): DataFrame with the Mii data
+        - columns (list): Names of the columns to convert if they exist
+
+    Returns:
+        - pd.DataFrame: Copy of the DataFrame with the categorical columns
+    """
+    data = data.copy()
+    for column in columns:
+        if column in data.columns:
+            data[column] = data[column].astype("category")
+    return data
+
+
+def packUnknownBits(unknownBits: pd.DataFrame) -> pa.Table:
+    """
+    Pack the unknown bits of each Mii into a single binary value
+
+    The bit columns are the ones named with the position of the bit,
+    every other column (Name, Creator, File) is kept as it is.
+    The positions are stored in the metadata of the table,
+    so unpackUnknownBits can restore the original columns.
+
+    Args:
+        - unknownBits (pd.DataFrame): DataFrame from getMiiUnknownBits
+
+    Returns:
+        - pa.Table: Table with the other columns and a "Bits" column
+    """
+    bitColumns = [c for c in unknownBits.columns if not isinstance(c, str)]
+    otherColumns = [c for c in unknownBits.columns if isinstance(c, str)]
+
+    bits = unknownBits[bitColumns].to_numpy(dtype=np.uint8)
+    packed = np.packbits(bits, axis=1, bitorder="little")
+    nBytes = packed.shape[1]
+
+    table = pa.Table.from_pandas(
+        toCategorical(unknownBits[otherColumns]), preserve_index=False
+    )
+    if nBytes:
+        bitsColumn = pa.FixedSizeBinaryArray.from_buffers(
+            pa.binary(nBytes), len(packed), [None, pa.py_buffer(packed.tobytes())]
+        )
+    else:
+        # Parquet doesn't allow fixed size binaries of length 0
+        bitsColumn = pa.array([b""] * len(packed), type=pa.binary())
+    table = table.append_column("Bits", bitsColumn)
+
+    metadata = dict(table.schema.metadata or {})
+    metadata[b"positions"] = json.dumps([int(c) for c in bitColumns]).encode()
+    return table.replace_schema_metadata(metadata)
+
+
+def unpackUnknownBits(table: pa.Table) -> pd.DataFrame:
+    """
+    Unpack a table created by packUnknownBits
+
+    Args:
+        - table (pa.Table): Table with a "Bits" column
+
+    Returns:
+        - pd.DataFrame: The same DataFrame as getMiiUnknownBits
+    """
+    positions = json.loads(table.schema.metadata[b"positions"])
+
+    bitsColumn = table.column("Bits").combine_chunks()
+    if positions:
+        nBytes = bitsColumn.type.byte_width
+        packed = np.frombuffer(
+            bitsColumn.buffers()[1],
+            dtype=np.uint8,
+            count=len(bitsColumn) * nBytes,
+            offset=bitsColumn.offset * nBytes,
+        ).reshape(len(bitsColumn), nBytes)
+        bits = np.unpackbits(packed, axis=1, count=len(positions), bitorder="little")
+    else:
+        bits = np.zeros((len(bitsColumn), 0), dtype=np.uint8)
+
+    data = table.drop_columns(["Bits"]).to_pandas()
+    for column in data.columns:
+        if isinstance(data[column].dtype, pd.CategoricalDtype):
+            data[column] = data[column].astype(str)
+
+    unknownBits = pd.DataFrame(bits, columns=pd.Index(positions, name="Bit"))
+    return pd.concat([data, unknownBits], axis=1)
+
+
+def toTable(data: pd.DataFrame) -> pa.Table:
+    """
+    Convert a DataFrame to an Arrow table
+
+    The names of the columns must be strings, so the
+    unknown bytes columns are renamed to their position.
+    The bytes are stored as uint8 instead of int64.
+
+    Args:
+        - data (pd.DataFrame): The DataFrame to convert
+
+    Returns:
+        - pa.Table: The Arrow table
+    """
+    data = toCategorical(data)
+    byteColumns = [c for c in data.columns if not isinstance(c, str)]
+    data[byteColumns] = data[byteColumns].astype(np.uint8)
+    data.columns = [str(c) for c in data.columns]
+    return pa.Table.from_pandas(data, preserve_index=False)
+
+
+def writeTable(table: pa.Table, filePath: str) -> None:
+    """
+    Write an Arrow table to a Parquet or Arrow file
+
+    The format is chosen from the extension of the file.
+    The Arrow files are not compressed so they
+    can be memory mapped without copying them.
+
+    Args:
+        - table (pa.Table): The table to write
+        - filePath (str): The path to the file
+
+    Returns:
+        - None
+    """
+    if filePath.endswith(FORMATS["parquet"]):
+        pq.write_table(table, filePath, compression="zstd")
+    elif filePath.endswith(FORMATS["arrow"]):
+        feather.write_feather(table, filePath, compression="uncompressed")
+    else:
+        raise ValueError(f"Unknown format for {filePath}")
+
+
+def readTable(filePath: str) -> pa.Table:
+    """
+    Read an Arrow table from a Parquet or Arrow file
+
+    The Arrow files are memory mapped.
+
+    Args:
+        - filePath (str): The path to the file
+
+    Returns:
+        - pa.Table: The table
+    """
+    if filePath.endswith(FORMATS["parquet"]):
+        return pq.read_table(filePath)
+    elif filePath.endswith(FORMATS["arrow"]):
+        return feather.read_table(filePath, memory_map=True)
+    else:
+        raise ValueError(f"Unknown format for {filePath}")
+
+
+def writeTables(
+    miiData: pd.DataFrame,
+    unknownBytes: pd.DataFrame,
+    unknownBits: pd.DataFrame,
+    directory: str = ".",
+    fileFormat: str = "parquet",
+    assumptionViolations: pd.DataFrame = None,
+) -> None:
+    """
+    Write the Mii data, the unknown bytes and the unknown bits
+
+    They are written to miis, miisUnknownBytes and miisUnknownBits
+    with the extension of the format. The assumption violations,
+    if given, are written to miisAssumptionViolations.
+
+    Args:
+        - miiData (pd.DataFrame): DataFrame from getMiiData
+        - unknownBytes (pd.DataFrame): DataFrame from getMiiUnknownBytes
+        - unknownBits (pd.DataFrame): DataFrame from getMiiUnknownBits
+        - directory (str): The directory where the files are written
+        - fileFormat (str): "parquet" or "arrow"
+        - assumptionViolations (pd.DataFrame): DataFrame from getAssumptionViolations
+
+    Returns:
+        - None
+    """
+    extension = FORMATS[fileFormat]
+    os.makedirs(directory, exist_ok=True)
+
+    writeTable(toTable(miiData), os.path.join(directory, "miis" + extension))
+    writeTable(
+        toTable(unknownBytes), os.path.join(directory, "miisUnknownBytes" + extension)
+    )
+    writeTable(
+        packUnknownBits(unknownBits),
+        os.path.join(directory, "miisUnknownBits" + extension),
+    )
+
+    if assumptionViolations is not None:
+        writeTable(
+            toTable(assumptionViolations),
+            os.path.join(directory, "miisAssumptionViolations" + extension),
+        )
@@ -1,16 +1,55 @@
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.patches import Circle
-import matplotlib.font_manager as fm
-import matplotlib.pyplot as plt
-import tkinter.font as tkfont
-import tkinter as tk
+from typing import TYPE_CHECKING
+import platformdirs
 import pandas as pd
 import numpy as np
 import itertools
+import json
+import glob
 import sys
+import os
+
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
 
 
 class Grapher:
+    """
+    Graphs of the data of the Miis
+
+    Matplotlib and Tkinter are only imported when
+    the first graph is drawn, so decoding the Miis
+    doesn't have to pay for them.
+    """
+
+    # List of fonts that typically support CJK characters
+    CJK_FONTS = [
+        "Noto Sans CJK JP",
+        "Noto Sans CJK SC",
+        "Noto Sans CJK TC",
+        "Noto Sans CJK KR",
+        "SimSun",
+        "Microsoft YaHei",
+        "Malgun Gothic",
+        "Yu Gothic",
+        "Hiragino Sans",
+        "Apple SD Gothic Neo",
+        "Source Han Sans",
+        "WenQuanYi Micro Hei",
+        "Droid Sans Fallback",
+        "Arial Unicode MS",
+    ]
+
+    FALLBACK_FONT = "DejaVu Sans"
+
+    # Number of legend labels measured to find the width of the legend
+    MEASURED_ROWS = 50
+
+    fontCacheFile = os.path.join(
+        platformdirs.user_cache_dir("MiiPlazaDecoder"), "font.json"
+    )
+
+    bestFont = None
+
     @staticmethod
     def _get_best_font() -> str:
         """
@@ -22,38 +61,109 @@ class Grapher:
         Returns:
             str: Font name that supports CJK characters
         """
-        # List of fonts that typically support CJK characters
-        cjk_fonts = [
-            "Noto Sans CJK JP",
-            "Noto Sans CJK SC",
-            "Noto Sans CJK TC",
-            "Noto Sans CJK KR",
-            "SimSun",
-            "Microsoft YaHei",
-            "Malgun Gothic",
-            "Yu Gothic",
-            "Hiragino Sans",
-            "Apple SD Gothic Neo",
-            "Source Han Sans",
-            "WenQuanYi Micro Hei",
-            "Droid Sans Fallback",
-            "Arial Unicode MS",
-        ]
+        import matplotlib.font_manager as fm
 
-        # Get list of available fonts
-        available_fonts = [f.name for f in fm.fontManager.ttflist]
+        # Get set of available fonts
+        available_fonts = {f.name for f in fm.fontManager.ttflist}
 
         # Find the first available CJK font
-        for font in cjk_fonts:
+        for font in Grapher.CJK_FONTS:
             if font in available_fonts:
                 return font
 
         # If no CJK font is found, return a fallback
-        return "DejaVu Sans"
+        return Grapher.FALLBACK_FONT
+
+    @staticmethod
+    def _get_font_list_key() -> dict:
+        """
+        Identify the list of fonts that matplotlib knows
+
+        Matplotlib keeps the fonts of the system in a cache file,
+        which is created again when it changes version or is deleted.
+
+        Args:
+            - None
+
+        Returns:
+            dict: The version of matplotlib and the modification
+                time of its font list
+        """
+        import matplotlib
+
+        fontLists = glob.glob(
+            os.path.join(matplotlib.get_cachedir(), "fontlist-*.json")
+        )
+        return {
+            "matplotlib": matplotlib.__version__,
+            "fontList": max(map(os.path.getmtime, fontLists), default=None),
+        }
+
+    @classmethod
+    def getBestFont(cls) -> str:
+        """
+        Get the best font, searching it only the first time
+
+        The font found is saved in the cache directory of the user,
+        so the fonts of the system are only searched again if
+        the list of CJK fonts or the font list of matplotlib change.
+        The fallback font is never saved, so a CJK font
+        installed later is found in the next run.
+
+        Args:
+            - None
+
+        Returns:
+            str: Font name that supports CJK characters
+        """
+        if cls.bestFont is not None:
+            return cls.bestFont
+
+        key = {"candidates": cls.CJK_FONTS, **cls._get_font_list_key()}
+
+        try:
+            with open(cls.fontCacheFile, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached["key"] == key:
+                cls.bestFont = cached["font"]
+                return cls.bestFont
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        cls.bestFont = cls._get_best_font()
+
+        if cls.bestFont == cls.FALLBACK_FONT:
+            return cls.bestFont
+
+        # Searching the fonts may have created the font list of matplotlib
+        key = {"candidates": cls.CJK_FONTS, **cls._get_font_list_key()}
+
+        try:
+            os.makedirs(os.path.dirname(cls.fontCacheFile), exist_ok=True)
+            with open(cls.fontCacheFile, "w", encoding="utf-8") as f:
+                json.dump({"key": key, "font": cls.bestFont}, f)
+        except OSError:
+            # The font is still used, only the cache is lost
+            pass
+
+        return cls.bestFont
+
+    @staticmethod
+    def getValueCounts(
+        data: pd.Series, topN: int = None, minPercentage: float = None
+    ) -> tuple:
+        """
+        Count how many times each value appears
 
-    BEST_FONT = _get_best_font()
+        Args:
+            - data (pd.Series): The values of a column
+            - topN (int): Maximum number of values kept, the rest go to "Other"
+            - minPercentage (float): Values below this percentage go to "Other"
 
-    def graphPieChart(self, data: pd.Series) -> plt.Figure:
+        Returns:
+            - tuple: The values (np.ndarray) and their counts (np.ndarray),
+                sorted by count (descending) and then by value (ascending)
+        """
         valueCounts = data.value_counts().reset_index()
         valueCounts.columns = [data.name, "count"]
 
@@ -62,8 +172,79 @@ class Grapher:
             by=["count", data.name], ascending=[False, True]
         )
 
-        self.labels = valueCounts[data.name].values
-        self.sizes = valueCounts["count"].values
+        return Grapher.reduceCategories(
+            valueCounts[data.name].values,
+            valueCounts["count"].values,
+            topN,
+            minPercentage,
+        )
+
+    @staticmethod
+    def reduceCategories(
+        labels: np.ndarray,
+        sizes: np.ndarray,
+        topN: int = None,
+        minPercentage: float = None,
+        otherLabel: str = "Other",
+    ) -> tuple:
+        """
+        Join the least common values into a single one
+
+        With thousands of values most wedges are too small
+        to be seen, but each one still has to be drawn.
+        The values must be sorted by count (descending).
+
+        Args:
+            - labels (np.ndarray): The values
+            - sizes (np.ndarray): The number of times each value appears
+            - topN (int): Maximum number of values kept
+            - minPercentage (float): Values below this percentage are joined
+            - otherLabel (str): The name of the joined value
+
+        Returns:
+            - tuple: The kept values with the joined one at the end
+                and their counts
+        """
+        nKept = len(sizes)
+
+        if topN is not None:
+            nKept = min(nKept, topN)
+
+        if minPercentage is not None:
+            percentages = sizes / sizes.sum() * 100
+            nKept = min(nKept, int(np.count_nonzero(percentages >= minPercentage)))
+
+        # Joining a single value doesn't make the chart any simpler
+        if nKept >= len(sizes) - 1:
+            return labels, sizes
+
+        labels = np.append(labels[:nKept].astype(object), otherLabel)
+        sizes = np.append(sizes[:nKept], sizes[nKept:].sum())
+        return labels, sizes
+
+    def drawPieChart(self, ax, labels: np.ndarray, sizes: np.ndarray, title) -> None:
+        """
+        Draw a pie chart on the given axes
+
+        It doesn't create any figure, so it can be
+        used with any backend.
+
+        Args:
+            - ax (matplotlib.axes.Axes): The axes where the chart is drawn
+            - labels (np.ndarray): The values
+            - sizes (np.ndarray): The number of times each value appears
+            - title: The name of the column
+
+        Returns:
+            - None
+        """
+        from matplotlib.collections import LineCollection
+        from matplotlib.patches import Circle
+        import matplotlib
+
+        self.labels = labels
+        self.sizes = sizes
+        self.ax = ax
         total = sum(self.sizes)
 
         threshold = 2
@@ -76,7 +257,7 @@ class Grapher:
             for label, size in zip(self.labels, self.sizes)
         ]
 
-        colorCycle = itertools.cycle(plt.cm.tab10.colors)
+        colorCycle = itertools.cycle(matplotlib.colormaps["tab10"].colors)
 
         # Get the colors
         colorMap = {
@@ -85,52 +266,110 @@ class Grapher:
         }
         self.wedgeColors = [colorMap[int(size)] for size in self.sizes]
 
-        # Plot figure
-        fig, self.ax = plt.subplots(figsize=(6, 6))
-
         self.ax.pie(
             self.sizes,
             labels=finalLabels,
             autopct=autopct_format,
             startangle=0,
             shadow=False,
-            textprops={"fontname": self.BEST_FONT},
+            textprops={"fontname": self.getBestFont()},
             colors=self.wedgeColors,
         )
 
         # Calculate cumulative angles for boundaries between wedges
         cumulative = np.cumsum([0] + self.sizes) / total * 360
 
-        # Draw black lines between wedges (edges)
-        for i in range(len(self.sizes)):
-            if self.sizes[i] != self.sizes[(i + 1) % len(self.sizes)]:
-                angle = cumulative[i]  # boundary after wedge i
-                theta = np.deg2rad(angle)
-                r = 1
-                self.ax.plot(
-                    [0, r * np.cos(theta)],
-                    [0, r * np.sin(theta)],
-                    color="black",
-                    linewidth=1.5,
-                )
+        # Draw black lines between wedges (edges), all in one collection
+        boundaries = np.flatnonzero(self.sizes != np.roll(self.sizes, -1))
+        theta = np.deg2rad(cumulative[boundaries])  # boundary after wedge i
+        r = 1
+        segments = np.zeros((len(boundaries), 2, 2))
+        segments[:, 1, 0] = r * np.cos(theta)
+        segments[:, 1, 1] = r * np.sin(theta)
+        self.ax.add_collection(LineCollection(segments, colors="black", linewidths=1.5))
 
         # Add a black circular border around the pie chart
         circle = Circle((0, 0), 1, edgecolor="black", facecolor="none", linewidth=1.5)
         self.ax.add_patch(circle)
 
-        self.ax.set_title(f"Distribution of {data.name}")
+        self.ax.set_title(f"Distribution of {title}")
         self.ax.set_aspect("equal")
 
+    def graphPieChart(
+        self, data: pd.Series, topN: int = None, minPercentage: float = None
+    ) -> "plt.Figure":
+        import matplotlib.pyplot as plt
+
+        labels, sizes = self.getValueCounts(data, topN, minPercentage)
+
+        # Plot figure
+        fig, ax = plt.subplots(figsize=(6, 6))
+        self.drawPieChart(ax, labels, sizes, data.name)
+
         return fig
 
-    def graphPieChartTkinter(self, data: pd.Series) -> None:
+    def renderPieCharts(
+        self,
+        data: pd.DataFrame,
+        columns: list,
+        directory: str,
+        fileFormat: str = "png",
+        topN: int = None,
+        minPercentage: float = None,
+    ) -> list:
+        """
+        Save the pie charts of many columns to files without opening windows
+
+        The Agg backend is used directly, without pyplot,
+        so it works without a display. A single figure
+        is cleared and reused for all the charts.
+
+        Args:
+            - data (pd.DataFrame): The data of the Miis
+            - columns (list): The columns to graph
+            - directory (str): The directory where the charts are saved
+            - fileFormat (str): The format of the files, like "png" or "svg"
+            - topN (int): Maximum number of values kept, the rest go to "Other"
+            - minPercentage (float): Values below this percentage go to "Other"
+
+        Returns:
+            - list: The paths to the saved charts
+        """
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        os.makedirs(directory, exist_ok=True)
+
+        fig = Figure(figsize=(6, 6))
+        FigureCanvasAgg(fig)
+
+        filePaths = []
+        for column in columns:
+            labels, sizes = self.getValueCounts(data[column], topN, minPercentage)
+
+            fig.clear()
+            self.drawPieChart(fig.add_subplot(), labels, sizes, column)
+
+            filePath = os.path.join(directory, f"{column}.{fileFormat}")
+            fig.savefig(filePath, format=fileFormat)
+            filePaths.append(filePath)
+
+        return filePaths
+
+    def graphPieChartTkinter(
+        self, data: pd.Series, topN: int = None, minPercentage: float = None
+    ) -> None:
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        import matplotlib.pyplot as plt
+        import tkinter.font as tkfont
+        import tkinter as tk
 
         def on_closing():
             plt.close("all")
             root.destroy()
             sys.exit()
 
-        fig = self.graphPieChart(data)
+        fig = self.graphPieChart(data, topN, minPercentage)
 
         # Tkinter window
         root = tk.Tk()
@@ -138,19 +377,20 @@ class Grapher:
         root.wm_title("Scrollable Legend Pie Chart")
         root.protocol("WM_DELETE_WINDOW", on_closing)
 
-        # Create hidden window to measure content
-        hidden_win = tk.Toplevel(root)
-        hidden_win.withdraw()  # Hide it
-
         # Find widest label and size
-        test_font = tkfont.Font(family=self.BEST_FONT, size=9)
-        max_label_width = max(test_font.measure(label) for label in self.labels)
-        max_size_width = max(test_font.measure(str(size)) for size in self.sizes)
+        # Only the longest labels are measured, since with thousands
+        # of them measuring every one freezes the window
+        legend_font = tkfont.Font(family=self.getBestFont(), size=9)
+        longest_labels = sorted(map(str, self.labels), key=len)[-self.MEASURED_ROWS :]
+        max_label_width = max(legend_font.measure(label) for label in longest_labels)
+        max_size_width = legend_font.measure(str(max(self.sizes)))
 
         needed_width = (
             max_label_width + max_size_width + (4 * 10)
         )  # Add padding manually
 
+        row_height = legend_font.metrics("linespace") + 4
+
         # Matplotlib canvas
         canvas = FigureCanvasTkAgg(fig, master=root)
         canvas.draw()
@@ -190,49 +430,69 @@ class Grapher:
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
         legend_canvas = tk.Canvas(
-            legend_frame, width=needed_width, yscrollcommand=scrollbar.set
+            legend_frame, width=needed_width, highlightthickness=0
         )
         legend_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.config(command=legend_canvas.yview)
 
-        # Create a frame inside the canvas to hold labels
-        labels_frame = tk.Frame(legend_canvas)
-        canvas_window = legend_canvas.create_window(
-            (0, 0), window=labels_frame, anchor="nw"
+        # The scroll region has the size of all the rows,
+        # but only the visible ones are drawn
+        legend_canvas.config(
+            scrollregion=(0, 0, needed_width, row_height * len(self.labels)),
+            yscrollincrement=row_height,
         )
 
-        # Add legend entries as labels inside labels_frame
-        for idx, (label, size) in enumerate(zip(self.labels, self.sizes)):
-            # Convert matplotlib color to hex for tkinter
-            color = self.wedgeColors[idx]
-            hex_color = f"#{int(color[0]*255):02x}{int(color[1]*255):02x}{int(color[2]*255):02x}"
-
-            # Create a colored frame for the entire row
-            row_frame = tk.Frame(labels_frame, bg=hex_color)
-            row_frame.grid(row=idx, column=0, columnspan=2, sticky="ew", padx=0, pady=0)
-            row_frame.grid_columnconfigure(0, weight=1)
-            row_frame.grid_columnconfigure(1, weight=1)
-
-            lbl_label = tk.Label(
-                row_frame,
-                text=label,
-                font=(self.BEST_FONT, 9),
-                anchor="w",
-                bg=hex_color,
-            )
-            lbl_size = tk.Label(
-                row_frame,
-                text=str(size),
-                font=(self.BEST_FONT, 9),
-                anchor="e",
-                bg=hex_color,
-            )
-            lbl_label.grid(row=0, column=0, sticky="w", padx=5, pady=2)
-            lbl_size.grid(row=0, column=1, sticky="ew", padx=(5, 5), pady=2)
-
-        # Update scrollregion when all widgets are in place
-        labels_frame.update_idletasks()
-        legend_canvas.config(scrollregion=legend_canvas.bbox("all"))
+        # Convert matplotlib colors to hex for tkinter
+        hex_colors = [
+            f"#{int(color[0]*255):02x}{int(color[1]*255):02x}{int(color[2]*255):02x}"
+            for color in self.wedgeColors
+        ]
+
+        # Canvas items (background, label, size) reused for the visible rows
+        row_items = []
+
+        def draw_visible_rows():
+            top = int(legend_canvas.canvasy(0) // row_height)
+            n_visible = legend_canvas.winfo_height() // row_height + 2
+            width = max(legend_canvas.winfo_width(), needed_width)
+
+            while len(row_items) < n_visible:
+                row_items.append(
+                    (
+                        legend_canvas.create_rectangle(0, 0, 0, 0, width=0),
+                        legend_canvas.create_text(0, 0, anchor="w", font=legend_font),
+                        legend_canvas.create_text(0, 0, anchor="e", font=legend_font),
+                    )
+                )
+
+            for idx, (background, lbl_label, lbl_size) in enumerate(row_items):
+                row = top + idx
+                if idx >= n_visible or row >= len(self.labels):
+                    for item in (background, lbl_label, lbl_size):
+                        legend_canvas.itemconfigure(item, state="hidden")
+                    continue
+
+                y0 = row * row_height
+                y_center = y0 + row_height / 2
+                legend_canvas.coords(background, 0, y0, width, y0 + row_height)
+                legend_canvas.coords(lbl_label, 5, y_center)
+                legend_canvas.coords(lbl_size, width - 5, y_center)
+                legend_canvas.itemconfigure(
+                    background, fill=hex_colors[row], state="normal"
+                )
+                legend_canvas.itemconfigure(
+                    lbl_label, text=str(self.labels[row]), state="normal"
+                )
+                legend_canvas.itemconfigure(
+                    lbl_size, text=str(self.sizes[row]), state="normal"
+                )
+
+        def on_scroll(first, last):
+            # Called every time the view of the legend changes
+            scrollbar.set(first, last)
+            draw_visible_rows()
+
+        legend_canvas.config(yscrollcommand=on_scroll)
 
         # Bind mousewheel to scroll the legend_canvas
         def _on_mousewheel(event):
@@ -244,20 +504,14 @@ class Grapher:
             elif event.num == 5:
                 legend_canvas.yview_scroll(1, "units")
 
-        def on_frame_configure(event):
-            # Update scrollregion after resizing the labels_frame
-            legend_canvas.configure(scrollregion=legend_canvas.bbox("all"))
-
         def on_canvas_configure(event):
-            # Make sure labels_frame width fits the canvas width
-            canvas_width = event.width
-            legend_canvas.itemconfig(canvas_window, width=canvas_width)
+            # Redraw the rows to fit the new size of the canvas
+            draw_visible_rows()
 
         # Bind mousewheel events for both Windows and Linux
         legend_canvas.bind_all("<MouseWheel>", _on_mousewheel)  # Windows
         legend_canvas.bind_all("<Button-4>", _on_mousewheel_linux)  # Linux scroll up
         legend_canvas.bind_all("<Button-5>", _on_mousewheel_linux)  # Linux scroll down
-        labels_frame.bind("<Configure>", on_frame_configure)
         legend_canvas.bind("<Configure>", on_canvas_configure)
 
         # Dinamically change the size
@@ -268,9 +522,12 @@ class Grapher:
 
         root.mainloop()
 
-    def graphPieChartMatplotlib(self, data: pd.Series) -> None:
+    def graphPieChartMatplotlib(
+        self, data: pd.Series, topN: int = None, minPercentage: float = None
+    ) -> None:
+        import matplotlib.pyplot as plt
 
-        fig = self.graphPieChart(data)
+        fig = self.graphPieChart(data, topN, minPercentage)
 
         # Create legend with all original labels and counts
         legendHandles = [
@@ -289,7 +546,7 @@ class Grapher:
             legendHandles,
             legendLabels,
             bbox_to_anchor=(1.02, 0, 0.07, 1),
-            prop={"family": self.BEST_FONT},
+            prop={"family": self.getBestFont()},
         )
 
         # Adjust layout to prevent legend from being cut off
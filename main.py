@@ -1,24 +1,29 @@
 import miiPlaza
+import export
 
 if __name__ == "__main__":
 
     # We open the file
-    with open("meet.dat", "rb") as f:
-        data = f.read()
+    plaza = miiPlaza.MiiPlaza.fromPath("meet.dat")
 
-    plaza = miiPlaza.MiiPlaza(data)
+    miiData = plaza.getMiiData()
+    unknownBytes = plaza.getMiiUnknownBytes()
+    unknownBits = plaza.getMiiUnknownBits()
 
     with open("miis.csv", "w", encoding="utf-8", newline="") as f:
         # We write the Mii data to a CSV file
-        plaza.getMiiData().to_csv(f, index=False)
+        miiData.to_csv(f, index=False)
 
     with open("miisUnknownBytes.csv", "w", encoding="utf-8", newline="") as f:
-        plaza.getMiiUnknownBytes().to_csv(f, index=False)
+        unknownBytes.to_csv(f, index=False)
 
     with open("miisUnknownBits.csv", "w", encoding="utf-8", newline="") as f:
-        plaza.getMiiUnknownBits().to_csv(f, index=False)
+        unknownBits.to_csv(f, index=False)
+
+    # Also as Parquet, which is much faster to read than CSV
+    export.writeTables(miiData, unknownBytes, unknownBits)
 
     with open("result.txt", "w", encoding="utf-8") as f:
-        f.write(plaza.hexdump())
+        plaza.writeHexdump(f)
 
     plaza.graphPieChart("GameName")
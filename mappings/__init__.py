@@ -1,4 +1,4 @@
-from .software import Software
+from .software import Software, Resolver
 from .outfit import Outfit
 from .preferredPet import PreferredPet
 from .dream import Dream
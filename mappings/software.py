@@ -1,16 +1,31 @@
+from concurrent.futures import ThreadPoolExecutor
 import xml.etree.ElementTree as ET
 from bs4 import BeautifulSoup
-from Modules import Internet
+from contextlib import closing, contextmanager
 import platformdirs
 import requests
 import zipfile
+import sqlite3
+import atexit
+import pathlib
 import json
 import time
+import zlib
 import glob
 import os
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
 
-def titleFromhshop(gameID: str) -> str:
+HSHOP_URL = "https://hshop.erista.me"
+
+
+def titleFromhshop(
+    gameID: str, session: requests.Session = None, baseUrl: str = HSHOP_URL
+) -> str:
     """
     Get the game name from hshop based on the game ID.
 
@@ -19,12 +34,16 @@ def titleFromhshop(gameID: str) -> str:
 
     Args:
         - gameID (str): The ID of the game to search for.
+        - session (requests.Session): Session to reuse the connections.
+        - baseUrl (str): The address of the hShop.
 
     Returns:
         - str: The name of the game if found, otherwise "Unknown Game".
     """
-    url = f"https://hshop.erista.me/search/results?q={gameID}&qt=TitleID"
-    response = requests.get(url)
+    http = session or requests
+
+    url = f"{baseUrl}/search/results?q={gameID}&qt=TitleID"
+    response = http.get(url)
     if response.status_code == 200:
         soup = BeautifulSoup(response.text, "html.parser")
 
@@ -66,9 +85,9 @@ def titleFromhshop(gameID: str) -> str:
         # Try to find name in English
         if productCode:
             # Remove last character to get all regions
-            url = f"https://hshop.erista.me/search/results?q={productCode[:-1]}&qt=ProductCode"
+            url = f"{baseUrl}/search/results?q={productCode[:-1]}&qt=ProductCode"
 
-            response = requests.get(url)
+            response = http.get(url)
             if response.status_code == 200:
                 soup = BeautifulSoup(response.text, "html.parser")
 
@@ -101,58 +120,353 @@ def titleFromhshop(gameID: str) -> str:
     return "Unknown Game"
 
 
+def titlesFromhshop(
+    gameIDs: list, maxConcurrent: int = 8, baseUrl: str = HSHOP_URL
+) -> dict:
+    """
+    Get the game names of many game IDs from hshop.
+
+    The searches are made concurrently, sharing
+    a pool of connections, with at most maxConcurrent
+    of them at the same time.
+
+    It only uses threads, so it can also be called
+    from a running event loop (Jupyter, async services).
+
+    Args:
+        - gameIDs (list): The IDs of the games to search for.
+        - maxConcurrent (int): The maximum number of searches at the same time.
+        - baseUrl (str): The address of the hShop.
+
+    Returns:
+        - dict: The game IDs as keys and their names
+            (or "Unknown Game") as values.
+    """
+    if not gameIDs:
+        return {}
+
+    with requests.Session() as session:
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=maxConcurrent)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        with ThreadPoolExecutor(max_workers=maxConcurrent) as executor:
+            names = executor.map(
+                lambda gameID: titleFromhshop(gameID, session, baseUrl), gameIDs
+            )
+            return dict(zip(gameIDs, names))
+
+
 def getDatabase(filePath: str) -> dict:
     """
     Get the database from the given file path.
 
+    The file is only read. If it doesn't exist
+    an empty database is returned and the file
+    is created the first time something is added.
+
     Args:
         - filePath (str): The path to the database file.
 
     Returns:
         - dict: The database as a dictionary.
     """
-    # Ensure it exists
     if not os.path.exists(filePath):
-        with open(filePath, "w", encoding="utf-8") as f:
-            json.dump({}, f, ensure_ascii=False, indent=4)
+        return {}
 
     with open(filePath, "r", encoding="utf-8") as fRead:
-        data = json.load(fRead)
+        return json.load(fRead)
 
-    # Sort the data by keys
-    data = dict(sorted(data.items()))
 
-    with open(filePath, "w", encoding="utf-8") as fWrite:
-        json.dump(data, fWrite, ensure_ascii=False, indent=4)
+def writeDatabase(filePath: str, data: dict) -> None:
+    """
+    Write a database to the given file path.
 
-    return data
+    The keys are sorted and the data is written
+    to a temporary file that then replaces the database,
+    so a reader never sees a half-written file.
+
+    Args:
+        - filePath (str): The path to the database file.
+        - data (dict): The database as a dictionary.
+
+    Returns:
+        - None
+    """
+    tmpFile = f"{filePath}.{os.getpid()}.tmp"
+
+    with open(tmpFile, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(data.items())), f, ensure_ascii=False, indent=4)
+
+    os.replace(tmpFile, filePath)
+
+
+# New games waiting to be written, by database file
+pendingUpdates = {}
 
 
 def updateDatabase(filePath: str, gameName: str, gameID: str) -> None:
     """
-    Update the hshop database with a new game name.
+    Update a database with a new game name.
+
+    The game is only buffered, the file is written
+    when flushDatabases() is called.
 
     Args:
-        - filePath (str): Path to the hshop.json file.
+        - filePath (str): Path to the database file.
         - gameName (str): The name of the game to add.
         - gameID (str): The ID of the game to add.
 
     Returns:
         - None
     """
-    with open(filePath, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    pendingUpdates.setdefault(filePath, {})[gameID] = gameName
+
+
+# Unknown games waiting to be written, by database file
+pendingUnknownGames = {}
+
+
+def updateUnknownGames(filePath: str, expiry: float, gameID: str) -> None:
+    """
+    Update the database of unknown games with a new game.
+
+    The game is only buffered, the file is written
+    when flushDatabases() is called.
+
+    Args:
+        - filePath (str): Path to the unknown.json file.
+        - expiry (float): The time until which the game isn't searched again.
+        - gameID (str): The ID of the game to add.
+
+    Returns:
+        - None
+    """
+    pendingUnknownGames.setdefault(filePath, {})[gameID] = expiry
+
+
+@contextmanager
+def lockDatabase(filePath: str):
+    """
+    Lock a database so only one process can update it.
+
+    A separate .lock file is locked, because the
+    database itself is replaced when it is written.
+    It waits until the lock is free.
+
+    Args:
+        - filePath (str): The path to the database file.
+
+    Returns:
+        - None
+    """
+    with open(f"{filePath}.lock", "a+b") as lockFile:
+        if fcntl:
+            fcntl.flock(lockFile.fileno(), fcntl.LOCK_EX)
+        else:
+            lockFile.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lockFile.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after 10 seconds
+                    pass
+
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lockFile.fileno(), fcntl.LOCK_UN)
+            else:
+                lockFile.seek(0)
+                msvcrt.locking(lockFile.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def flushDatabases() -> None:
+    """
+    Write all the buffered games to their databases.
+
+    Each database is locked and read again just before
+    writing it, so the games added by other processes
+    at the same time are kept.
+    The unknown games whose time has expired are removed.
+
+    Args:
+        - None
+
+    Returns:
+        - None
+    """
+    while pendingUpdates:
+        filePath, games = pendingUpdates.popitem()
+
+        with lockDatabase(filePath):
+            data = getDatabase(filePath)
+            data.update(games)
+            writeDatabase(filePath, data)
+
+    while pendingUnknownGames:
+        filePath, games = pendingUnknownGames.popitem()
+
+        with lockDatabase(filePath):
+            data = getDatabase(filePath)
+            data.update(games)
 
-    data[gameID] = gameName
+            now = time.time()
+            data = {gameID: expiry for gameID, expiry in data.items() if expiry > now}
+            writeDatabase(filePath, data)
 
-    # Order the keys alphabetically
-    data = dict(sorted(data.items()))
 
-    with open(filePath, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
+atexit.register(flushDatabases)
 
 
-def getDatomatic() -> dict:
+def getIndexVersion(tables: dict) -> int:
+    """
+    Get the version of the index that stores the given tables.
+
+    It changes whenever a table or a database is
+    added, removed or moved, so an index built
+    for other tables is never used.
+
+    Args:
+        - tables (dict): Table names as keys and lists of database files as values.
+
+    Returns:
+        - int: A positive 31 bit number, to store it as PRAGMA user_version.
+    """
+    return zlib.crc32(json.dumps(tables, sort_keys=True).encode()) & 0x7FFFFFFF
+
+
+def buildIndex(indexFile: str, tables: dict) -> None:
+    """
+    Compile the JSON databases into a single SQLite index.
+
+    Each table is filled with its databases in order,
+    so later databases override earlier ones.
+    The index is built in a temporary file and then renamed,
+    so other processes never open a half-built index.
+
+    Args:
+        - indexFile (str): The path to the index file.
+        - tables (dict): Table names as keys and lists of database files as values.
+
+    Returns:
+        - None
+    """
+    tmpFile = f"{indexFile}.{os.getpid()}.tmp"
+    if os.path.exists(tmpFile):
+        os.remove(tmpFile)
+
+    with closing(sqlite3.connect(tmpFile)) as connection:
+        for table, databaseFiles in tables.items():
+            connection.execute(
+                f"CREATE TABLE {table} "
+                "(titleID TEXT PRIMARY KEY, name TEXT NOT NULL) WITHOUT ROWID"
+            )
+            for databaseFile in databaseFiles:
+                connection.executemany(
+                    f"INSERT OR REPLACE INTO {table} VALUES (?, ?)",
+                    getDatabase(databaseFile).items(),
+                )
+        connection.execute(f"PRAGMA user_version = {getIndexVersion(tables)}")
+        connection.commit()
+
+    os.replace(tmpFile, indexFile)
+
+
+def openIndex(indexFile: str, tables: dict) -> sqlite3.Connection:
+    """
+    Open the SQLite index of the databases.
+
+    If the index doesn't exist, was built for other tables
+    or any of the databases has changed since it was built,
+    it is built again.
+    It is opened read-only and memory-mapped, so a lookup
+    doesn't need to parse or keep the databases in memory.
+
+    Args:
+        - indexFile (str): The path to the index file.
+        - tables (dict): Table names as keys and lists of database files as values.
+
+    Returns:
+        - sqlite3.Connection: A read-only connection to the index.
+    """
+    databaseFiles = [
+        databaseFile
+        for databaseFiles in tables.values()
+        for databaseFile in databaseFiles
+        if os.path.exists(databaseFile)
+    ]
+
+    if not os.path.exists(indexFile) or any(
+        os.path.getmtime(databaseFile) > os.path.getmtime(indexFile)
+        for databaseFile in databaseFiles
+    ):
+        buildIndex(indexFile, tables)
+
+    connection = sqlite3.connect(
+        f"{pathlib.Path(indexFile).as_uri()}?mode=ro", uri=True
+    )
+
+    (version,) = connection.execute("PRAGMA user_version").fetchone()
+    if version != getIndexVersion(tables):
+        connection.close()
+        buildIndex(indexFile, tables)
+        connection = sqlite3.connect(
+            f"{pathlib.Path(indexFile).as_uri()}?mode=ro", uri=True
+        )
+
+    connection.execute("PRAGMA mmap_size = 268435456")
+    return connection
+
+
+def parseDatomatic(file) -> dict:
+    """
+    Parse a datomatic database as a stream.
+
+    Each game is cleared as soon as it has been read,
+    so the whole XML tree is never in memory.
+    Only the serials and the clones are kept.
+
+    Args:
+        - file (file object): The XML file opened in binary mode.
+
+    Returns:
+        - dict: A dictionary with game IDs as keys and original game IDs as values.
+    """
+    serials = {}
+    clones = []
+
+    context = ET.iterparse(file, events=("start", "end"))
+    _, root = next(context)
+
+    for event, element in context:
+        if event == "end" and element.tag == "game":
+            rom = element.find("rom")
+            serial = rom.get("serial") if rom is not None else None
+
+            if serial:
+                currentID = serial.encode("utf-8").hex().upper()
+
+                if "id" in element.attrib:
+                    serials[element.attrib["id"]] = currentID
+
+                if element.attrib.get("cloneofid"):
+                    clones.append((currentID, element.attrib["cloneofid"]))
+
+            # The game won't be needed again
+            root.clear()
+
+    # The original can appear after its clones
+    return {
+        currentID: serials[cloneID]
+        for currentID, cloneID in clones
+        if cloneID in serials
+    }
+
+
+def getDatomatic(filePath: str = None) -> dict:
     """
     Get the dictionary of DS games from the datomatic database.
 
@@ -164,91 +478,110 @@ def getDatomatic() -> dict:
 
     There might be more games here than in the dstdb.
 
+    If no file is given, it is downloaded with Selenium
+    and deleted after reading it.
+
     Args:
-        - None
+        - filePath (str): Path to a downloaded database, zipped or not.
 
     Returns:
         - dict: A dictionary with game IDs as keys and original game IDs as values.
     """
-    url = "https://datomatic.no-intro.org/index.php?page=download&op=dat&s=28"
+    downloaded = filePath is None
 
-    driver = Internet.configureChrome()
+    if downloaded:
+        # Selenium is only needed here
+        from Modules import Internet
 
-    driver.maximize_window()
+        url = "https://datomatic.no-intro.org/index.php?page=download&op=dat&s=28"
 
-    driver.get(url)
+        driver = Internet.configureChrome()
 
-    Internet.clickButton(driver, "Prepare")
-    Internet.clickButton(driver, "Download!!")
+        driver.maximize_window()
 
-    # Wait for the download to end
-    time.sleep(5)
+        driver.get(url)
 
-    # Close the browser
-    driver.quit()
+        Internet.clickButton(driver, "Prepare")
+        Internet.clickButton(driver, "Download!!")
 
-    downloadsPath = platformdirs.user_downloads_dir()
+        # Wait for the download to end
+        time.sleep(5)
 
-    # Find the most recent Nintendo DS database file
-    pattern = os.path.join(downloadsPath, "Nintendo - Nintendo DS (Decrypted) (*).zip")
-    matching_files = glob.glob(pattern)
+        # Close the browser
+        driver.quit()
 
-    if not matching_files:
-        raise FileNotFoundError("No Nintendo DS database file found in downloads")
+        downloadsPath = platformdirs.user_downloads_dir()
 
-    # Get the most recent file based on modification time
-    filePath = max(matching_files, key=os.path.getmtime)
+        # Find the most recent Nintendo DS database file
+        pattern = os.path.join(
+            downloadsPath, "Nintendo - Nintendo DS (Decrypted) (*).zip"
+        )
+        matching_files = glob.glob(pattern)
 
-    # Read the only file inside the ZIP
-    with zipfile.ZipFile(filePath, "r") as zip_ref:
-        file_names = zip_ref.namelist()
+        if not matching_files:
+            raise FileNotFoundError("No Nintendo DS database file found in downloads")
 
-        if len(file_names) != 1:
-            raise ValueError("Expected exactly one file in the ZIP archive.")
+        # Get the most recent file based on modification time
+        filePath = max(matching_files, key=os.path.getmtime)
 
-        internal_file_name = file_names[0]
+    if zipfile.is_zipfile(filePath):
+        # Read the only file inside the ZIP
+        with zipfile.ZipFile(filePath, "r") as zip_ref:
+            file_names = zip_ref.namelist()
 
-        # Read the file's data (as bytes)
-        data = zip_ref.read(internal_file_name)
+            if len(file_names) != 1:
+                raise ValueError("Expected exactly one file in the ZIP archive.")
 
-    # Delete the ZIP file
-    os.remove(filePath)
+            with zip_ref.open(file_names[0]) as f:
+                nameChanger = parseDatomatic(f)
 
-    root = ET.fromstring(data.decode("utf-8"))
+    else:
+        with open(filePath, "rb") as f:
+            nameChanger = parseDatomatic(f)
 
-    nameChanger = {}
+    if downloaded:
+        # Delete the ZIP file
+        os.remove(filePath)
 
-    idMap = {
-        child.attrib["id"]: child
-        for child in root
-        if child.tag == "game" and "id" in child.attrib
-    }
+    return nameChanger
 
-    for child in root:
-        if child.tag == "game":
-            if child.attrib.get("cloneofid"):
 
-                serial = child.find("rom").get("serial")
+def parseDSGames(lines) -> dict:
+    """
+    Parse the lines of the dstdb one by one.
 
-                if serial:
+    Args:
+        - lines (iterable): The lines of the dstdb.txt file.
 
-                    currentID = serial.encode("utf-8").hex().upper()
+    Returns:
+        - dict: A dictionary with game IDs as keys and game names as values.
+    """
+    data = {}
+    lines = iter(lines)
 
-                    ogID = (
-                        idMap[child.attrib["cloneofid"]]
-                        .find("rom")
-                        .get("serial")
-                        .encode("utf-8")
-                        .hex()
-                        .upper()
-                    )
+    # First line is not a game
+    next(lines, None)
 
-                nameChanger[currentID] = ogID
+    for game in lines:
+        if " = " not in game:
+            continue
 
-    return nameChanger
+        asciiID, title = game.split(" = ", 1)
 
+        # Clean the variables
+        asciiID = asciiID.strip()
+        title = title.strip()
 
-def getDSGames() -> dict:
+        # All DS games begin with 00048000 or 0048004
+        # so we will need to check it later
+        hexID = asciiID.encode("utf-8").hex().upper()
+
+        data[hexID] = title
+
+    return data
+
+
+def getDSGames(filePath: str = None, datomaticFile: str = None) -> dict:
     """
     Get the dictionary of DS games.
 
@@ -256,10 +589,13 @@ def getDSGames() -> dict:
     but no DS games. Because we trust the hSHop more,
     we only use this when we haven't found the game.
 
-    We keep the database downloaded.
+    We keep the database downloaded. If local copies
+    of dstdb.txt or the datomatic database are given,
+    they are used instead of downloading them.
 
     Args:
-        - None
+        - filePath (str): Path to a dstdb.txt file.
+        - datomaticFile (str): Path to a datomatic database.
 
     Returns:
         - dict: A dictionary with game IDs as keys and game names as values.
@@ -267,57 +603,135 @@ def getDSGames() -> dict:
     currentDirectory = os.path.dirname(os.path.abspath(__file__))
     databaseFile = os.path.join(currentDirectory, "dstdb.json")
 
-    if not os.path.exists(databaseFile):
-        url = "https://www.gametdb.com/dstdb.txt?LANG=ORIG"
-        data = {}
-
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0 Safari/537.36"
-        }  # Pretend to be human
-        response = requests.get(url, headers=headers)
+    if filePath or not os.path.exists(databaseFile):
+        data = None
 
-        # Check if the request was successful
-        if response.status_code == 200:
-            textContent = response.text.strip()
+        if filePath:
+            with open(filePath, "r", encoding="utf-8") as f:
+                data = parseDSGames(f)
 
-            # First line is not a game
-            games = textContent.split("\n")[1:]
-
-            for game in games:
-                asciiID, title = game.split(" = ")
+        else:
+            url = "https://www.gametdb.com/dstdb.txt?LANG=ORIG"
 
-                # Clean the variables
-                asciiID = asciiID.strip()
-                title = title.strip()
+            headers = {
+                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0 Safari/537.36"
+            }  # Pretend to be human
+            response = requests.get(url, headers=headers, stream=True)
 
-                # All DS games begin with 00048000 or 0048004
-                # so we will need to check it later
-                hexID = asciiID.encode("utf-8").hex().upper()
+            # Check if the request was successful
+            if response.status_code == 200:
+                response.encoding = response.encoding or "utf-8"
+                data = parseDSGames(response.iter_lines(decode_unicode=True))
 
-                data[hexID] = title
+            else:
+                print(f"Failed to fetch file: {response.status_code}")
 
+        if data is not None:
             # Standardize names
-            for key, value in getDatomatic().items():
-                if data.get(key):
+            for key, value in getDatomatic(datomaticFile).items():
+                if key in data and value in data:
                     data[key] = data[value]
 
-            # Sort by ID
-            data = dict(sorted(data.items()))
+            writeDatabase(databaseFile, data)
+
+    return getDatabase(databaseFile)
+
+
+class Resolver:
+    """
+    Class representing a source of game names that
+    is used when a game isn't in the local databases.
 
-            with open(databaseFile, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
+    Software tries the resolvers in order until one
+    finds the game. The names found are stored in
+    the resolver's database so they are not searched again.
 
+    It keeps count of how many games it has searched,
+    how many it has found and how long it has taken.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        find,
+        databaseFile: str = None,
+        online: bool = False,
+        findAll=None,
+    ) -> None:
+        """
+        Initialize Resolver object
+
+        Args:
+            - name (str): The name of the resolver.
+            - find (callable): Function that returns the name of a game ID
+                or None (or "Unknown Game") if it can't find it.
+            - databaseFile (str): Database where the names found are stored.
+                If None, they are not stored.
+            - online (bool): Whether the resolver needs the network.
+            - findAll (callable): Optional function that searches a list of
+                game IDs at once and returns a dictionary with their names.
+
+        Returns:
+            - None
+        """
+        self.name = name
+        self.find = find
+        self.findAll = findAll
+        self.databaseFile = databaseFile
+        self.online = online
+
+        self.searched = 0
+        self.found = 0
+        self.seconds = 0.0
+
+    def search(self, gameIDs: list) -> dict:
+        """
+        Search many games.
+
+        Args:
+            - gameIDs (list): The IDs of the games.
+
+        Returns:
+            - dict: The game IDs found as keys and their names as values.
+        """
+        start = time.perf_counter()
+
+        if self.findAll:
+            results = self.findAll(gameIDs)
         else:
-            print(f"Failed to fetch file: {response.status_code}")
+            results = {gameID: self.find(gameID) for gameID in gameIDs}
 
-    return getDatabase(databaseFile)
+        results = {
+            gameID: gameName
+            for gameID, gameName in results.items()
+            if gameName not in (None, "Unknown Game")
+        }
+
+        self.seconds += time.perf_counter() - start
+        self.searched += len(gameIDs)
+        self.found += len(results)
+
+        return results
+
+    def getStats(self) -> dict:
+        """
+        Get the counters of the resolver.
+
+        Args:
+            - None
+
+        Returns:
+            - dict: The number of games searched and found
+                and the seconds spent searching.
+        """
+        return {"Searched": self.searched, "Found": self.found, "Seconds": self.seconds}
 
 
 class Software:
     """
     Class to decode software/game names based on their string ID.
 
-    We use 4 databases:
+    We use 5 databases:
 
         - hshop.json
             Stores the games already searched for in the hShop.
@@ -340,6 +754,14 @@ class Software:
             Stores software not found anywhere else.
             They tend to be system applications and homebrew.
 
+        - unknown.json
+            Stores the games that couldn't be found anywhere,
+            with the time until which they won't be searched again.
+
+    They are compiled into software.db, a SQLite index that is
+    built again whenever one of them changes, so looking up
+    a game doesn't need to parse any of the JSON files.
+
     There is one one game I found that is has the wrong name:
         - 00040000000F9800 魔界王子 devils and realist - 代理王の秘宝
     It seems it is a real game, but the creators of
@@ -352,10 +774,266 @@ class Software:
     personalDatabaseFile = os.path.join(currentDirectory, "software.json")
     localDSFile = os.path.join(currentDirectory, "dsLocal.json")
 
-    decoder = getDatabase(databaseFile)
-    decoder.update(getDatabase(personalDatabaseFile))
-    decoder.update(getDatabase(localDSFile))
-    decoderDS = getDSGames()
+    dsDatabaseFile = os.path.join(currentDirectory, "dstdb.json")
+    unknownFile = os.path.join(currentDirectory, "unknown.json")
+    indexFile = os.path.join(currentDirectory, "software.db")
+
+    # The databases of each table of the index, in order of priority
+    indexTables = {
+        "software": [databaseFile, personalDatabaseFile, localDSFile],
+        "ds": [dsDatabaseFile],
+        "unknown": [unknownFile],
+    }
+
+    # Opened on the first lookup, not when the module is imported
+    index = None
+    checkedDS = False
+
+    # Games already looked up by this process
+    decoder = {}
+
+    # Time until an unknown game is searched again
+    unknownTTL = 30 * 24 * 60 * 60
+
+    hshopUrl = HSHOP_URL
+    maxConcurrentSearches = 8
+
+    # The resolvers tried after the local databases, in order.
+    # In offline mode the ones that need the network are skipped.
+    resolvers = None
+    offline = False
+
+    @classmethod
+    def getIndex(cls) -> sqlite3.Connection:
+        """
+        Get the connection to the index of the databases,
+        opening it the first time it is needed.
+
+        Args:
+            - None
+
+        Returns:
+            - sqlite3.Connection: A read-only connection to the index.
+        """
+        if cls.index is None:
+            cls.index = openIndex(cls.indexFile, cls.indexTables)
+
+        return cls.index
+
+    @classmethod
+    def closeIndex(cls) -> None:
+        """
+        Close the index so it is opened again,
+        and rebuilt if needed, on the next lookup.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        if cls.index is not None:
+            cls.index.close()
+            cls.index = None
+
+    @classmethod
+    def lookup(cls, table: str, gameID: str) -> str | None:
+        """
+        Find a game in a table of the index.
+
+        Args:
+            - table (str): The table of the index.
+            - gameID (str): The ID of the game.
+
+        Returns:
+            - str | None: The name of the game or None if it isn't there.
+        """
+        row = (
+            cls.getIndex()
+            .execute(f"SELECT name FROM {table} WHERE titleID = ?", (gameID,))
+            .fetchone()
+        )
+        return row[0] if row else None
+
+    @classmethod
+    def lookupDS(cls, gameID: str) -> str | None:
+        """
+        Find a game in the DS games.
+
+        This is only used as a last resort,
+        so the download of the DS database
+        only happens if a game can't be found.
+        It is never downloaded in offline mode.
+
+        Args:
+            - gameID (str): The last 8 characters of the game ID.
+
+        Returns:
+            - str | None: The name of the game or None if it isn't there.
+        """
+        if not cls.checkedDS and not cls.offline:
+            cls.checkedDS = True
+            if not os.path.exists(cls.dsDatabaseFile):
+                getDSGames()
+                cls.closeIndex()
+
+        return cls.lookup("ds", gameID)
+
+    @classmethod
+    def findLocal(cls, gameID: str) -> str | None:
+        """
+        Find a game without searching online.
+
+        Games that couldn't be found recently
+        are returned as "Unknown Game".
+
+        Args:
+            - gameID (str): The ID of the game.
+
+        Returns:
+            - str | None: The name of the game or None if it isn't known.
+        """
+        gameName = cls.decoder.get(gameID, None)
+        if gameName is None:
+            gameName = cls.lookup("software", gameID)
+
+            if gameName is None:
+                # The index stores the expiry time as text
+                expiry = cls.lookup("unknown", gameID)
+                if expiry is not None and float(expiry) > time.time():
+                    gameName = "Unknown Game"
+
+            if gameName is not None:
+                cls.decoder[gameID] = gameName
+
+        return gameName
+
+    @classmethod
+    def getResolvers(cls) -> list:
+        """
+        Get the resolvers used for the games
+        that aren't in the local databases.
+
+        By default the hShop is searched first
+        and then the DS games.
+
+        Args:
+            - None
+
+        Returns:
+            - list: The resolvers in order.
+        """
+        if cls.resolvers is None:
+            cls.resolvers = [
+                Resolver(
+                    "hShop",
+                    lambda gameID: titleFromhshop(gameID, baseUrl=cls.hshopUrl),
+                    cls.databaseFile,
+                    online=True,
+                    findAll=lambda gameIDs: titlesFromhshop(
+                        gameIDs, cls.maxConcurrentSearches, cls.hshopUrl
+                    ),
+                ),
+                Resolver(
+                    "dstdb", lambda gameID: cls.lookupDS(gameID[-8:]), cls.localDSFile
+                ),
+            ]
+
+        return cls.resolvers
+
+    @classmethod
+    def getResolverStats(cls) -> dict:
+        """
+        Get the counters of all the resolvers.
+
+        Args:
+            - None
+
+        Returns:
+            - dict: The names of the resolvers as keys and their counters as values.
+        """
+        return {resolver.name: resolver.getStats() for resolver in cls.getResolvers()}
+
+    @classmethod
+    def addGame(cls, gameID: str, gameName: str, databaseFile: str = None) -> None:
+        """
+        Store the name found for a game.
+
+        Args:
+            - gameID (str): The ID of the game.
+            - gameName (str): The name of the game.
+            - databaseFile (str): The database where it is stored, if any.
+
+        Returns:
+            - None
+        """
+        if databaseFile:
+            updateDatabase(databaseFile, gameName, gameID)
+
+        cls.decoder[gameID] = gameName
+
+    @classmethod
+    def addUnknownGame(cls, gameID: str) -> None:
+        """
+        Store a game that no resolver could find.
+
+        It won't be searched again until the TTL expires,
+        unless it was only searched offline.
+
+        Args:
+            - gameID (str): The ID of the game.
+
+        Returns:
+            - None
+        """
+        print(f"Unknown game ID: {gameID}")
+
+        if not cls.offline:
+            expiry = time.time() + cls.unknownTTL
+            updateUnknownGames(cls.unknownFile, expiry, gameID)
+
+        cls.decoder[gameID] = "Unknown Game"
+
+    @classmethod
+    def searchGames(cls, gameIDs: list, flush: bool = True) -> None:
+        """
+        Search the games that aren't known with the resolvers.
+
+        Each resolver searches at once all the games
+        that the previous ones couldn't find (the hShop
+        concurrently), so afterwards creating a Software
+        object for any of them doesn't need to wait for the network.
+
+        Args:
+            - gameIDs (list): The IDs of the games.
+            - flush (bool): Whether to write the new games to the databases,
+                otherwise they are buffered until flushDatabases() is called.
+
+        Returns:
+            - None
+        """
+        unknownIDs = sorted(
+            {gameID for gameID in gameIDs if cls.findLocal(gameID) is None}
+        )
+
+        for resolver in cls.getResolvers():
+            if not unknownIDs:
+                break
+
+            if cls.offline and resolver.online:
+                continue
+
+            for gameID, gameName in resolver.search(unknownIDs).items():
+                cls.addGame(gameID, gameName, resolver.databaseFile)
+
+            unknownIDs = [gameID for gameID in unknownIDs if gameID not in cls.decoder]
+
+        for gameID in unknownIDs:
+            cls.addUnknownGame(gameID)
+
+        if flush:
+            # The worker processes of a pool don't run atexit
+            flushDatabases()
 
     def __init__(self, gameID: str) -> None:
         """
@@ -368,25 +1046,10 @@ class Software:
             - str: The name of the game.
         """
         assert len(gameID) == 16
-        self.gameName = self.decoder.get(gameID, None)
+        self.gameName = self.findLocal(gameID)
         if self.gameName is None:
-
-            # Try to find it in the hShop
-            self.gameName = titleFromhshop(gameID)
-
-            if self.gameName == "Unknown Game":
-
-                # Try to find in dstbd
-                self.gameName = self.decoderDS.get(gameID[-8:], "Unknown Game")
-                if self.gameName == "Unknown Game":
-                    print(f"Unknown game ID: {gameID}")
-                else:
-                    updateDatabase(self.localDSFile, self.gameName, gameID)
-
-            else:
-                updateDatabase(self.databaseFile, self.gameName, gameID)
-
-            self.decoder[gameID] = self.gameName
+            self.searchGames([gameID], flush=False)
+            self.gameName = self.decoder[gameID]
 
     def getGameName(self) -> str:
         """
@@ -129,20 +129,90 @@ class Mii:
         emptyBits
     ), "Some bits in emptyBits fall inside emptyBytes"
 
-    def __init__(self, bytesData: bytes) -> None:
+    # Attribute -> method that decodes it
+    lazySetters = {
+        "name": "setName",
+        "creator": "setCreator",
+        "dateLastCrossedWith": "setDateLastCrossedWith",
+        "gameID": "setGameID",
+        "gameName": "setGameName",
+        "country": "setCountry",
+        "subregion": "setSubregion",
+        "nCrossedWith": "setNumberCrossedWith",
+        "streetPassHits": "setStreetPassHits",
+        "plazaPopulation": "setPlazaPopulation",
+        "outfit": "setOutfit",
+        "preferredPet": "setPreferredPet",
+        "dream": "setDream",
+        "hobby": "setHobby",
+        "premium": "setPremium",
+        "macOUI": "setMACOUI",
+    }
+
+    # No __dict__ per Mii, only the raw data and the decoded attributes
+    __slots__ = ("bytesData", *lazySetters)
+
+    def __init__(self, bytesData: bytes | memoryview, lazy: bool = False) -> None:
         """
         Initialize Mii object with bytes data
 
+        The data can be a memoryview into the savefile,
+        so the Mii doesn't need its own copy of the bytes.
+
+        If lazy is True, nothing is decoded here.
+        Each attribute is decoded the first time it is read
+        and the assumptions are not checked unless
+        checkAssumptions() is called.
+
         Args:
-            - bytesData (bytes): The raw bytes data of the Mii
+            - bytesData (bytes | memoryview): The raw bytes data of the Mii
+            - lazy (bool): Whether to decode the attributes on demand
 
         Returns:
             - None
         """
         assert len(bytesData) == self.MII_SIZE, "Invalid Mii size"
         self.bytesData = bytesData
-        self.setAll()
-        self.checkAssumptions()
+        if not lazy:
+            self.setAll()
+            self.checkAssumptions()
+
+    def __getattr__(self, attribute: str):
+        """
+        Decode an attribute that hasn't been set yet
+
+        This is only called when the attribute is missing,
+        so once the setter has run the value is read
+        directly from the object.
+
+        Args:
+            - attribute (str): The name of the attribute
+
+        Returns:
+            - The decoded value of the attribute
+        """
+        setter = self.lazySetters.get(attribute)
+        if setter is None:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{attribute}'"
+            )
+        getattr(self, setter)()
+        return object.__getattribute__(self, attribute)
+
+    def __reduce__(self) -> tuple:
+        """
+        Pickle the Mii as a copy of its bytes
+
+        A memoryview can't be pickled, and the attributes
+        can be decoded again from the bytes.
+
+        Args:
+            - None
+
+        Returns:
+            - tuple: The class and the arguments to rebuild the Mii
+        """
+        return (type(self), (bytes(self.bytesData), True))
 
     def setAll(self) -> None:
         """
@@ -192,7 +262,7 @@ class Mii:
             and currentPosition < 20
         ):
             byte = self.bytesData[currentPosition : currentPosition + 2]
-            name += byte.decode("utf-16le")
+            name += bytes(byte).decode("utf-16le")
             currentPosition += 2
 
         self.name = name
@@ -219,7 +289,7 @@ class Mii:
             and currentPosition < 66
         ):
             byte = self.bytesData[currentPosition : currentPosition + 2]
-            creator += byte.decode("utf-16le")
+            creator += bytes(byte).decode("utf-16le")
             currentPosition += 2
 
         self.creator = creator
@@ -255,6 +325,19 @@ class Mii:
         For some reason, the bytes are reversed,
         so we reverse them to get the correct TitleID.
 
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        self.setGameID()
+        self.setGameName()
+
+    def setGameID(self) -> None:
+        """
+        Decode the TitleID of the last software used from bytes 78-86
+
         Args:
             - None
 
@@ -266,6 +349,17 @@ class Mii:
             TitleID += format(c, "02X")
 
         self.gameID = TitleID
+
+    def setGameName(self) -> None:
+        """
+        Look up the name of the last software used
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
         self.gameName = Software(self.gameID).getGameName()
 
     def setCountry(self) -> None:
@@ -278,7 +372,7 @@ class Mii:
         Returns:
             - None
         """
-        self.country = self.bytesData[86:150].decode("utf-16le").strip("\x00")
+        self.country = bytes(self.bytesData[86:150]).decode("utf-16le").strip("\x00")
 
     def setSubregion(self) -> None:
         """
@@ -290,7 +384,7 @@ class Mii:
         Returns:
             - None
         """
-        self.subregion = self.bytesData[150:214].decode("utf-16le").strip("\x00")
+        self.subregion = bytes(self.bytesData[150:214]).decode("utf-16le").strip("\x00")
 
     def setNumberCrossedWith(self) -> None:
         """
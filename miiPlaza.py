@@ -1,5 +1,13 @@
+from concurrent.futures import ProcessPoolExecutor
 from grapher import Grapher
+from miiTable import MiiTable
+from mappings import Software
 import pandas as pd
+import numpy as np
+import bitSearch
+import hashlib
+import mmap
+import io
 import mii
 
 
@@ -15,20 +23,128 @@ class MiiPlaza:
 
     MII_PLAZA_SIZE = 393216
 
-    def __init__(self, bytesData: bytes) -> None:
+    # The decoded data outside the Miis (first byte, last byte + 1)
+    REGIONS = {
+        "StreetPassTags": (278128, 278132),
+        "Tickets": (373606, 373608),
+        "FantasticRatings": (373974, 373976),
+    }
+
+    # Printable characters are kept in the hex dump, the rest are dots
+    ASCII_TABLE = bytes(b if 32 <= b < 127 else ord(".") for b in range(256))
+
+    # The columns with few different values, which can be shown as pie charts
+    PIE_CHART_COLUMNS = [
+        "GameName",
+        "Country",
+        "Subregion",
+        "Outfit",
+        "Hobby",
+        "Dream",
+        "PreferredPet",
+        "Creator",
+        "Premium",
+    ]
+
+    # The columns that are summarized with numbers
+    NUMERIC_COLUMNS = ["StreetPassHits", "NumberCrossedWith", "PlazaPopulation"]
+
+    # The bits of a Mii that are always empty
+    EMPTY_MASK = np.zeros(mii.Mii.MII_SIZE, dtype=np.uint8)
+    EMPTY_MASK[mii.Mii.emptyBytes] = 0xFF
+    np.bitwise_or.at(
+        EMPTY_MASK,
+        np.array(mii.Mii.emptyBits) // 8,
+        np.left_shift(1, np.array(mii.Mii.emptyBits) % 8).astype(np.uint8),
+    )
+
+    def __init__(self, bytesData: bytes | mmap.mmap, lazy: bool = False) -> None:
         """
         Initialize MiiPlaza object with bytes data
 
         Args:
-            - bytesData (bytes): The raw bytes data of the Mii
+            - bytesData (bytes | mmap.mmap): The raw bytes data of the Mii
+            - lazy (bool): Whether the Miis decode their attributes on demand
 
         Returns:
             - None
         """
         assert len(bytesData) == self.MII_PLAZA_SIZE, "Invalid Mii Plaza size"
         self.bytesData = bytesData
+        self.lazy = lazy
         self.setAll()
 
+    @classmethod
+    def fromPath(cls, filePath: str, lazy: bool = False) -> "MiiPlaza":
+        """
+        Create a MiiPlaza object from a meet.dat file
+
+        The file is memory-mapped instead of read,
+        so the file is not copied and only the pages
+        that are decoded are loaded from disk.
+
+        The map keeps a file descriptor open until close()
+        is called, so use it as a context manager or close it
+        before keeping many Mii Plazas in memory.
+
+        Args:
+            - filePath (str): The path to the meet.dat file
+            - lazy (bool): Whether the Miis decode their attributes on demand
+
+        Returns:
+            - MiiPlaza: The Mii Plaza of the file
+        """
+        with open(filePath, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        return cls(data, lazy=lazy)
+
+    def close(self) -> None:
+        """
+        Close the memory map of a Mii Plaza created with fromPath
+
+        The savefile and the bytes of each Mii are copied
+        to memory first, so the Mii Plaza and its Miis
+        can still be used after closing it.
+        Nothing is done if the data is already in memory.
+
+        Any NumPy view of the data (getMiiBytes, MiiTable)
+        must be deleted before, or BufferError is raised.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        if not isinstance(self.bytesData, mmap.mmap):
+            return
+
+        data = self.bytesData
+        self.bytesData = data[:]
+
+        # Point the Miis to the copy and release their views of the map
+        view = memoryview(self.bytesData)
+        pos = MiiTable.MII_TABLE_OFFSET
+        for m in self.miis:
+            oldView = m.bytesData
+            m.bytesData = view[pos : pos + mii.Mii.MII_SIZE]
+            oldView.release()
+            pos += mii.Mii.MII_SIZE
+
+        data.close()
+
+    def __enter__(self) -> "MiiPlaza":
+        return self
+
+    def __exit__(self, excType, excValue, traceback) -> None:
+        try:
+            self.close()
+        except BufferError:
+            # Don't hide the error that is already propagating
+            if excType is None:
+                raise
+
     def setAll(self) -> None:
         """
         Set all attributes of the Mii Plaza object by decoding the bytes data
@@ -44,7 +160,7 @@ class MiiPlaza:
         self.setNumberOfTickets()
         self.setFantasticRatings()
 
-    def setMiis(self) -> None:
+    def setMiis(self, previousMiis: dict = None) -> list:
         """
         Set all Mii attributes by decoding the bytes data
         from bytes 14154-278153.
@@ -53,21 +169,287 @@ class MiiPlaza:
         they are replaced in the same order except
         the VIPs, which are not replaced.
 
+        Each Mii is identified by a hash of its bytes,
+        so the Miis already decoded can be reused
+        wherever they are now, and only the new
+        or modified ones are decoded.
+
         Args:
-            - None
+            - previousMiis (dict): Hashes as keys and lists
+                of Miis already decoded as values
 
         Returns:
-            - None
+            - list: The Miis that have been decoded
         """
+        previousMiis = previousMiis or {}
         miis = []
+        miiHashes = []
+        newMiis = []
         pos = 14154
+        # The Miis point into the savefile instead of copying their bytes
+        view = memoryview(self.bytesData)
 
         while self.bytesData[pos] != 0 and len(miis) < 1000:
-            miiData = self.bytesData[pos : pos + mii.Mii.MII_SIZE]
-            miis.append(mii.Mii(miiData))
+            miiData = view[pos : pos + mii.Mii.MII_SIZE]
+            miiHash = hashlib.blake2b(miiData, digest_size=16).digest()
+
+            if previousMiis.get(miiHash):
+                # Same bytes, so the decoded attributes are still valid
+                m = previousMiis[miiHash].pop()
+                m.bytesData = miiData
+            else:
+                m = mii.Mii(miiData, lazy=True)
+                newMiis.append(m)
+
+            miis.append(m)
+            miiHashes.append(miiHash)
             pos += mii.Mii.MII_SIZE
 
+        # The statistics only depend on the Miis
+        if miiHashes != getattr(self, "miiHashes", None):
+            self.statistics = {}
+
         self.miis: list[mii.Mii] = miis
+        self.miiHashes: list[bytes] = miiHashes
+
+        if not self.lazy:
+            # Search all the unknown games at once instead of one by one
+            Software.searchGames([m.gameID for m in newMiis])
+
+            for m in newMiis:
+                m.setAll()
+
+            self.checkAssumptions()
+
+        return newMiis
+
+    def update(self, bytesData: bytes | mmap.mmap) -> list:
+        """
+        Update the Mii Plaza with a new version of the savefile
+
+        Only the Miis that are new or have changed are decoded,
+        the rest are reused even if they have moved.
+
+        If the previous data was memory-mapped, the map is closed,
+        unless a NumPy view of it is still alive, in which case
+        it is closed when the view is deleted.
+
+        Args:
+            - bytesData (bytes | mmap.mmap): The raw bytes data of the Mii
+
+        Returns:
+            - list: The Miis that have been decoded
+        """
+        assert len(bytesData) == self.MII_PLAZA_SIZE, "Invalid Mii Plaza size"
+
+        previousMiis = {}
+        for m, miiHash in zip(self.miis, self.miiHashes):
+            previousMiis.setdefault(miiHash, []).append(m)
+
+        previousData = self.bytesData
+        self.bytesData = bytesData
+        newMiis = self.setMiis(previousMiis)
+        self.setStreetPassTags()
+        self.setNumberOfTickets()
+        self.setFantasticRatings()
+
+        # The Miis that were not reused still point to the previous map
+        del previousMiis
+        if isinstance(previousData, mmap.mmap) and previousData is not bytesData:
+            try:
+                previousData.close()
+            except BufferError:
+                pass
+
+        return newMiis
+
+    def checkAssumptions(self) -> None:
+        """
+        Check the assumptions about the data of all the Miis.
+
+        It is the same as Mii.checkAssumptions
+        but all the Miis are checked at once.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        violations = self.getAssumptionViolations()
+
+        if not violations.empty:
+            first = violations.iloc[0]
+            if first["EmptyByte"]:
+                message = f"Byte {first['Byte']} is not empty in Mii {first['Name']}"
+            else:
+                message = f"Bit {first['Bit']} is not empty in Mii {first['Name']}"
+
+            raise AssertionError(
+                f"{message} ({len(violations)} bits that should be empty are set)"
+            )
+
+    def getAssumptionViolations(self) -> pd.DataFrame:
+        """
+        Find all the bits that should be empty but are not.
+
+        All the Miis are compared with a mask of
+        the empty bytes and bits at once.
+
+        If there are any, please report them as an issue.
+        It means that there could be data stored in those bits.
+
+        Args:
+            - None
+
+        Returns:
+            - pd.DataFrame: DataFrame with a row per bit that is set,
+                with the Mii, the byte, the bit and whether
+                the whole byte should be empty
+        """
+        miiIndexes, byteIndexes, bitIndexes = self.findSetBits(
+            self.getMiiBytes() & self.EMPTY_MASK
+        )
+
+        return pd.DataFrame(
+            {
+                "Mii": miiIndexes,
+                "Name": [self.miis[i].name for i in miiIndexes],
+                "Creator": [self.miis[i].creator for i in miiIndexes],
+                "Byte": byteIndexes,
+                "Bit": bitIndexes,
+                "EmptyByte": np.isin(byteIndexes, mii.Mii.emptyBytes),
+            }
+        )
+
+    @staticmethod
+    def findSetBits(matrix: np.ndarray) -> tuple:
+        """
+        Find all the bits that are set in a matrix of bytes.
+
+        Args:
+            - matrix (np.ndarray): Matrix of bytes
+
+        Returns:
+            - tuple: The row, the column (byte) and the
+                position of the bit (byte * 8 + bit) of each set bit
+        """
+        rowIndexes, byteIndexes = np.nonzero(matrix)
+
+        bits = np.unpackbits(
+            matrix[rowIndexes, byteIndexes][:, np.newaxis],
+            axis=1,
+            bitorder="little",
+        )
+        rows, bitIndexes = np.nonzero(bits)
+
+        return (
+            rowIndexes[rows],
+            byteIndexes[rows],
+            byteIndexes[rows] * 8 + bitIndexes,
+        )
+
+    def getMiiKeys(self) -> pd.DataFrame:
+        """
+        Get what identifies each Mii.
+
+        A Mii is identified by its Name and Creator.
+        If several Miis have the same ones,
+        they are told apart by their order.
+
+        Args:
+            - None
+
+        Returns:
+            - pd.DataFrame: DataFrame with the Name, Creator
+                and Occurrence of each Mii
+        """
+        keys = pd.DataFrame(
+            {
+                "Name": [m.name for m in self.miis],
+                "Creator": [m.creator for m in self.miis],
+            }
+        )
+        keys["Occurrence"] = keys.groupby(["Name", "Creator"]).cumcount()
+        return keys
+
+    def diff(self, other: "MiiPlaza") -> tuple:
+        """
+        Compare this Mii Plaza with another one bit by bit.
+
+        This helps find where characteristics are stored:
+        change one of them in the console and compare
+        the savefiles before and after.
+
+        The Miis are matched by their Name and Creator,
+        so it doesn't matter if they have moved.
+        Miis that are only in one of the savefiles are not compared.
+
+        Outside the Miis every byte is compared, and
+        the known regions (REGIONS) are labelled.
+
+        Args:
+            - other (MiiPlaza): The Mii Plaza to compare with
+
+        Returns:
+            - tuple: DataFrame with the changed bits of the Miis
+                and DataFrame with the changed bits outside the Miis
+        """
+        matched = (
+            self.getMiiKeys()
+            .assign(Row=np.arange(len(self.miis)))
+            .merge(
+                other.getMiiKeys().assign(OtherRow=np.arange(len(other.miis))),
+                on=["Name", "Creator", "Occurrence"],
+            )
+        )
+
+        before = self.getMiiBytes()[matched["Row"].to_numpy()]
+        after = other.getMiiBytes()[matched["OtherRow"].to_numpy()]
+        pairIndexes, byteIndexes, bitIndexes = self.findSetBits(before ^ after)
+
+        miiChanges = pd.DataFrame(
+            {
+                "Name": matched["Name"].to_numpy()[pairIndexes],
+                "Creator": matched["Creator"].to_numpy()[pairIndexes],
+                "Byte": byteIndexes,
+                "Bit": bitIndexes,
+                "Before": before[pairIndexes, byteIndexes],
+                "After": after[pairIndexes, byteIndexes],
+            }
+        )
+
+        before = np.frombuffer(self.bytesData, dtype=np.uint8)
+        after = np.frombuffer(other.bytesData, dtype=np.uint8)
+
+        # The Miis have already been compared, except the known regions
+        outside = np.ones(self.MII_PLAZA_SIZE, dtype=bool)
+        outside[
+            MiiTable.MII_TABLE_OFFSET : MiiTable.MII_TABLE_OFFSET
+            + MiiTable.MAX_MIIS * mii.Mii.MII_SIZE
+        ] = False
+        for regionStart, regionEnd in self.REGIONS.values():
+            outside[regionStart:regionEnd] = True
+
+        _, offsets, bitIndexes = self.findSetBits(
+            np.where(outside, before ^ after, 0)[np.newaxis, :]
+        )
+
+        regions = np.full(len(offsets), "Unknown", dtype=object)
+        for region, (regionStart, regionEnd) in self.REGIONS.items():
+            regions[(offsets >= regionStart) & (offsets < regionEnd)] = region
+
+        plazaChanges = pd.DataFrame(
+            {
+                "Region": regions,
+                "Byte": offsets,
+                "Bit": bitIndexes,
+                "Before": before[offsets],
+                "After": after[offsets],
+            }
+        )
+
+        return miiChanges, plazaChanges
 
     def setStreetPassTags(self) -> None:
         """
@@ -124,6 +506,21 @@ class MiiPlaza:
         data = [mii.getData() for mii in self.miis]
         return pd.DataFrame(data)
 
+    def getMiiTable(self) -> MiiTable:
+        """
+        Get all the Miis decoded column by column
+
+        This doesn't create a Mii object for each Mii,
+        so it is much faster when only the data is needed.
+
+        Args:
+            - None
+
+        Returns:
+            - MiiTable: Columnar view of all the Miis
+        """
+        return MiiTable(self.bytesData)
+
     def getMiiUnknownBytes(self) -> pd.DataFrame:
         """
         Get Mii unknown bytes as a pandas DataFrame
@@ -147,10 +544,61 @@ class MiiPlaza:
         Returns:
             - pd.DataFrame: DataFrame containing Mii names and unknown bits
         """
-        data = [mii.getUnknownBits() for mii in self.miis]
-        return pd.DataFrame(data)
+        bits, positions = self.getMiiUnknownBitMatrix()
+
+        unknownBits = pd.DataFrame(bits, columns=positions)
+        unknownBits.insert(0, "Name", [m.name for m in self.miis])
+        unknownBits.insert(1, "Creator", [m.creator for m in self.miis])
+        return unknownBits
+
+    def getMiiBytes(self) -> np.ndarray:
+        """
+        Get the bytes of all the Miis as a matrix
+
+        The matrix is a view of the savefile,
+        nothing is copied.
 
-    def findPossibleBits(self, classifier: pd.DataFrame, nBits: int) -> list:
+        Args:
+            - None
+
+        Returns:
+            - np.ndarray: Matrix with a row of 264 bytes per Mii
+        """
+        return np.frombuffer(
+            self.bytesData,
+            dtype=np.uint8,
+            count=len(self.miis) * mii.Mii.MII_SIZE,
+            offset=MiiTable.MII_TABLE_OFFSET,
+        ).reshape(len(self.miis), mii.Mii.MII_SIZE)
+
+    def getMiiUnknownBitMatrix(self) -> tuple:
+        """
+        Get Mii unknown bits as a matrix
+
+        The unknown bytes of all the Miis are unpacked
+        at once, instead of one bit at a time.
+
+        Args:
+            - None
+
+        Returns:
+            - tuple: Matrix of 0s and 1s (np.uint8) with a row per Mii
+                and a column per unknown bit, and the position
+                of the bit of each column (pd.Index)
+        """
+        unknownBytes = self.getMiiBytes()[:, mii.Mii.unknownBytes]
+        bits = np.unpackbits(unknownBytes, axis=1, bitorder="little")
+
+        positions = np.repeat(np.array(mii.Mii.unknownBytes) * 8, 8) + np.tile(
+            np.arange(8), len(mii.Mii.unknownBytes)
+        )
+        known = np.isin(positions, mii.Mii.unknownBits)
+
+        return bits[:, known], pd.Index(positions[known], name="Bit")
+
+    def findPossibleBits(
+        self, classifier: pd.DataFrame, nBits: int | range
+    ) -> list | dict:
         """
         This is to help find where possible characteristics are
         stored in the Mii data.
@@ -162,88 +610,352 @@ class MiiPlaza:
         We will find all the nBits bits that are together that
         have different values for each of the values of the characteristic.
 
+        Several numbers of bits can be searched at once
+        by giving a range instead of a single number.
+
+        Args:
+            - classifier (pd.DataFrame): DataFrame containing classifier data
+            - nBits (int | range): Number of bits to find
+
+        Returns:
+            - list | dict: List of possible bits, or a dictionary
+                with a list for each number of bits if a range was given
+        """
+        keys, bits, positions = self.prepareBitSearch()
+        _, rows, classes = self.matchClassifier(classifier, keys)
+
+        widths = [nBits] if isinstance(nBits, int) else list(nBits)
+        possibleBits = bitSearch.searchBits(bits[rows], positions, classes, widths)
+
+        return possibleBits[nBits] if isinstance(nBits, int) else possibleBits
+
+    def searchPossibleBits(
+        self, classifiers: list, nBits: int | range, maxWorkers: int = None
+    ) -> pd.DataFrame:
+        """
+        Search several characteristics at once with findPossibleBits.
+
+        The unknown bits are only built once and the
+        characteristics are searched in parallel processes.
+
+        The candidates are ranked so the most likely come first:
+        the ones that are the only candidate for their characteristic
+        and number of bits, then the ones backed by more Miis
+        and more classes.
+
+        Args:
+            - classifiers (list): DataFrames like the classifier of findPossibleBits
+            - nBits (int | range): Numbers of bits to find
+            - maxWorkers (int): Number of processes, by default one per core
+
+        Returns:
+            - pd.DataFrame: DataFrame with a row per candidate group of bits
+        """
+        keys, bits, positions = self.prepareBitSearch()
+        matches = [self.matchClassifier(classifier, keys) for classifier in classifiers]
+        widths = [nBits] if isinstance(nBits, int) else list(nBits)
+
+        with ProcessPoolExecutor(max_workers=maxWorkers) as executor:
+            futures = [
+                executor.submit(
+                    bitSearch.searchBits, bits[rows], positions, classes, widths
+                )
+                for _, rows, classes in matches
+            ]
+            results = [future.result() for future in futures]
+
+        candidates = []
+        for (classifierName, rows, classes), possibleBits in zip(matches, results):
+            nClasses = pd.Series(classes).nunique()
+
+            for width, groups in possibleBits.items():
+                for group in groups:
+                    candidates.append(
+                        {
+                            "Characteristic": classifierName,
+                            "NBits": width,
+                            "FirstBit": group[0],
+                            "LastBit": group[-1],
+                            "Byte": group[0] // 8,
+                            "Candidates": len(groups),
+                            "Classes": nClasses,
+                            "Miis": len(rows),
+                        }
+                    )
+
+        table = pd.DataFrame(
+            candidates,
+            columns=[
+                "Characteristic",
+                "NBits",
+                "FirstBit",
+                "LastBit",
+                "Byte",
+                "Candidates",
+                "Classes",
+                "Miis",
+            ],
+        )
+
+        return table.sort_values(
+            by=["Candidates", "Miis", "Classes", "NBits", "FirstBit"],
+            ascending=[True, False, False, True, True],
+            ignore_index=True,
+        )
+
+    def prepareBitSearch(self) -> tuple:
+        """
+        Build what the searches of bits need.
+
+        Args:
+            - None
+
+        Returns:
+            - tuple: DataFrame with the Name and Creator of each Mii,
+                matrix with the unknown bits of each Mii
+                and the position of each column of the matrix
+        """
+        bits, positions = self.getMiiUnknownBitMatrix()
+
+        keys = pd.DataFrame(
+            {
+                "Name": [m.name for m in self.miis],
+                "Creator": [m.creator for m in self.miis],
+            }
+        )
+
+        return keys, bits, positions.to_numpy()
+
+    @staticmethod
+    def matchClassifier(classifier: pd.DataFrame, keys: pd.DataFrame) -> tuple:
+        """
+        Find the Miis of a classifier.
+
         Args:
             - classifier (pd.DataFrame): DataFrame containing classifier data
-            - nBits (int): Number of bits to find
+            - keys (pd.DataFrame): DataFrame with the Name and Creator of each Mii
 
         Returns:
-            - list: List of possible bits
+            - tuple: The name of the characteristic, the rows
+                of the Miis found and their values
         """
-        unknownBits = self.getMiiUnknownBits()
         classifierName = [
             col for col in classifier.columns if col not in ("Name", "Creator")
         ][0]
 
-        # Normalize "Creator" in both dataframes
-        classifier["Creator"] = classifier["Creator"].fillna("")
-        unknownBits["Creator"] = unknownBits["Creator"].fillna("")
+        # Normalize "Creator"
+        classifier = classifier.fillna({"Creator": ""})
 
-        combinedDf = classifier.merge(unknownBits, on=["Name", "Creator"], how="inner")
-        combinedDf = combinedDf.drop(columns=["Name", "Creator"])
+        combinedDf = classifier.merge(
+            keys.assign(Row=np.arange(len(keys))), on=["Name", "Creator"], how="inner"
+        )
+
+        # Miis without a value are not used, like in a groupby
+        combinedDf = combinedDf.dropna(subset=[classifierName])
+
+        return (
+            classifierName,
+            combinedDf["Row"].to_numpy(),
+            combinedDf[classifierName].to_numpy(),
+        )
 
-        groupedDf = combinedDf.groupby(classifierName)
-        bitColumns = [col for col in combinedDf.columns if col != classifierName]
+    def hexdump(
+        self, width: int = 16, start: int = 0, end: int = None, offsets: bool = False
+    ) -> str:
+        """
+        Get a hex dump of the Mii Plaza data
 
-        possibleBits = []
+        Args:
+            - width (int): Number of bytes per line
+            - start (int): First byte of the dump
+            - end (int): Byte where the dump ends (not included),
+                by default the end of the file
+            - offsets (bool): Whether to start each line with its offset
 
-        for i in range(len(bitColumns) - nBits + 1):
-            group = bitColumns[i : i + nBits]
+        Returns:
+            - str: Hex dump of the Mii Plaza data
+        """
+        toret = io.StringIO()
+        self.writeHexdump(toret, width, start, end, offsets)
+        return toret.getvalue()
+
+    def writeHexdump(
+        self,
+        f: io.TextIOBase,
+        width: int = 16,
+        start: int = 0,
+        end: int = None,
+        offsets: bool = False,
+    ) -> None:
+        """
+        Write a hex dump of the Mii Plaza data to a file
 
-            # Check that the group is ascending and only 1 distance between bits
-            if max(group) - min(group) == nBits - 1:
+        The data is converted in blocks of lines,
+        each with a single bytes.hex and bytes.translate call,
+        and every block is written as soon as it is ready.
 
-                valid = True
+        A region can be dumped alone, for example only
+        the Miis with start=14154 and end=278154.
 
-                for cl, group_df in groupedDf:
-                    groupBits = group_df[group]
+        Args:
+            - f (io.TextIOBase): File where the dump is written
+            - width (int): Number of bytes per line
+            - start (int): First byte of the dump
+            - end (int): Byte where the dump ends (not included),
+                by default the end of the file
+            - offsets (bool): Whether to start each line with its offset
 
-                    # Check that all Miis in cl have the same value
-                    # We find the opposite
-                    if (groupBits.nunique() != 1).any():
-                        valid = False
-                        break
+        Returns:
+            - None
+        """
+        end = len(self.bytesData) if end is None else min(end, len(self.bytesData))
+        blockSize = width * 4096
 
-                if valid:
+        for blockStart in range(start, end, blockSize):
+            block = bytes(self.bytesData[blockStart : min(blockStart + blockSize, end)])
+            hexBlock = block.hex(" ").upper()
+            asciiBlock = block.translate(self.ASCII_TABLE).decode("ascii")
 
-                    # Now we check that all groups have different values
-                    patterns = (
-                        groupedDf[group].first().apply(lambda row: tuple(row), axis=1)
-                    )
-                    if patterns.is_unique:
-                        possibleBits.append(group)
+            lines = []
+            for lineStart in range(0, len(block), width):
+                lineEnd = min(lineStart + width, len(block))
 
-        return possibleBits
+                # Padding for shorter lines
+                hex_bytes = hexBlock[lineStart * 3 : lineEnd * 3 - 1].ljust(width * 3)
+                ascii_bytes = asciiBlock[lineStart:lineEnd]
 
-    def hexdump(self, width=16) -> str:
+                offset = f"{blockStart + lineStart:08X}\t" if offsets else ""
+                lines.append(f"{offset}{hex_bytes}\t{ascii_bytes}\n")
+
+            f.write("".join(lines))
+
+    def getStatistic(self, key, compute) -> object:
         """
-        Get a hex dump of the Mii Plaza data
+        Get a statistic of the Miis, computing it only the first time
+
+        The statistics are forgotten when the Miis change,
+        so they must not be modified.
+
+        Args:
+            - key: The name of the statistic
+            - compute (callable): Function that computes the statistic
+
+        Returns:
+            - object: The statistic
+        """
+        if key not in self.statistics:
+            self.statistics[key] = compute()
+        return self.statistics[key]
+
+    def getCachedMiiData(self) -> pd.DataFrame:
+        """
+        Get the same data as getMiiData, decoding it only once
+
+        The data is decoded column by column with the MiiTable.
 
         Args:
             - None
 
         Returns:
-            - str: Hex dump of the Mii Plaza data
+            - pd.DataFrame: DataFrame containing the data of all the Miis
         """
-        toret = ""
-        for offset in range(0, len(self.bytesData), width):
-            chunk = self.bytesData[offset : offset + width]
-            hex_bytes = " ".join(f"{b:02X}" for b in chunk)
-            ascii_bytes = "".join((chr(b) if 32 <= b < 127 else ".") for b in chunk)
+        return self.getStatistic("data", lambda: self.getMiiTable().getData())
 
-            # Padding for shorter lines
-            hex_bytes = hex_bytes.ljust(width * 3)
+    def getFrequencyTable(self, column: str) -> pd.Series:
+        """
+        Get how many Miis have each value of a column
 
-            line = f"{hex_bytes}\t{ascii_bytes}"
-            toret += line + "\n"
+        Args:
+            - column (str): The name of the column
 
-        return toret
+        Returns:
+            - pd.Series: The number of Miis of each value, most common first
+        """
+        return self.getStatistic(
+            ("frequency", column),
+            lambda: self.getCachedMiiData()[column].value_counts(),
+        )
+
+    def getNumericSummary(self) -> pd.DataFrame:
+        """
+        Get the count, mean, standard deviation, minimum,
+        quartiles and maximum of the numeric columns
+
+        Args:
+            - None
+
+        Returns:
+            - pd.DataFrame: A column for each of the NUMERIC_COLUMNS
+        """
+        return self.getStatistic(
+            "numeric",
+            lambda: self.getCachedMiiData()[self.NUMERIC_COLUMNS].describe(),
+        )
+
+    def getDateHistogram(self, frequency: str = "MS") -> pd.Series:
+        """
+        Get how many Miis were last crossed with in each period
+
+        The periods without any Mii are included with a 0.
 
-    def graphPieChart(self, column: str) -> None:
-        miiDf = self.getMiiData()
+        Args:
+            - frequency (str): The length of each period as a pandas
+                frequency, by default a month
+
+        Returns:
+            - pd.Series: The number of Miis with the start of each period as index
+        """
+        return self.getStatistic(
+            ("dates", frequency),
+            lambda: self.getCachedMiiData()
+            .set_index("DateLastCrossedWith")
+            .resample(frequency)
+            .size(),
+        )
+
+    def graphPieChart(
+        self, column: str, topN: int = None, minPercentage: float = None
+    ) -> None:
+        miiDf = self.getCachedMiiData()
 
-        Grapher().graphPieChartTkinter(miiDf[column])
+        Grapher().graphPieChartTkinter(miiDf[column], topN, minPercentage)
 
-    def graphPieChart2(self, column: str) -> None:
-        miiDf = self.getMiiData()
+    def graphPieChart2(
+        self, column: str, topN: int = None, minPercentage: float = None
+    ) -> None:
+        miiDf = self.getCachedMiiData()
 
-        Grapher().graphPieChartMatplotlib(miiDf[column])
+        Grapher().graphPieChartMatplotlib(miiDf[column], topN, minPercentage)
+
+    def renderPieCharts(
+        self,
+        directory: str,
+        columns: list = None,
+        fileFormat: str = "png",
+        topN: int = None,
+        minPercentage: float = None,
+    ) -> list:
+        """
+        Save the pie charts of many columns to files
+
+        It doesn't open any window, so it can be used
+        without a display.
+
+        Args:
+            - directory (str): The directory where the charts are saved
+            - columns (list): The columns to graph, by default PIE_CHART_COLUMNS
+            - fileFormat (str): The format of the files, like "png" or "svg"
+            - topN (int): Maximum number of values kept, the rest go to "Other"
+            - minPercentage (float): Values below this percentage go to "Other"
+
+        Returns:
+            - list: The paths to the saved charts
+        """
+        return Grapher().renderPieCharts(
+            self.getCachedMiiData(),
+            columns or self.PIE_CHART_COLUMNS,
+            directory,
+            fileFormat,
+            topN,
+            minPercentage,
+        )
@@ -0,0 +1,451 @@
+from mappings import Software, Outfit, PreferredPet, Dream, Hobby
+import pandas as pd
+import numpy as np
+import mii
+
+
+class MiiTable:
+    """
+    Columnar view of the Mii block of a Mii Plaza savefile.
+
+    Instead of creating a Mii object for every record,
+    the bytes 14154-278153 are viewed as a NumPy structured
+    array and every field is decoded for all the Miis at once.
+
+    The layout of the fields is the same one documented
+    in the Mii class. Only the decoded fields are named,
+    the rest of the bytes can be read from rawBytes.
+    """
+
+    MII_TABLE_OFFSET = 14154
+    MAX_MIIS = 1000
+
+    DTYPE = np.dtype(
+        {
+            "names": [
+                "name",
+                "creator",
+                "timestamp",
+                "titleID",
+                "country",
+                "subregion",
+                "nCrossedWith",
+                "streetPassHits",
+                "plazaPopulation",
+                "outfit",
+                "preferredPet",
+                "dream",
+                "hobby",
+                "premium",
+                "macOUI",
+            ],
+            "formats": [
+                ("<u2", (10,)),
+                ("<u2", (10,)),
+                ("u1", (5,)),
+                "<u8",
+                ("u1", (64,)),
+                ("u1", (64,)),
+                "<u2",
+                "<u2",
+                "<u2",
+                "u1",
+                "u1",
+                "u1",
+                "u1",
+                "u1",
+                ("u1", (3,)),
+            ],
+            "offsets": [
+                0,
+                46,
+                70,
+                78,
+                86,
+                150,
+                214,
+                218,
+                222,
+                224,
+                225,
+                226,
+                227,
+                231,
+                254,
+            ],
+            "itemsize": mii.Mii.MII_SIZE,
+        }
+    )
+
+    HEX = np.array([f"{i:02X}" for i in range(256)], dtype=object)
+
+    def __init__(self, bytesData: bytes) -> None:
+        """
+        Initialize MiiTable object with the bytes data
+        of the whole Mii Plaza savefile
+
+        No bytes are copied, the arrays are views
+        of the given buffer.
+
+        Args:
+            - bytesData (bytes): The raw bytes data of the Mii Plaza
+
+        Returns:
+            - None
+        """
+        rawBytes = np.frombuffer(
+            bytesData,
+            dtype=np.uint8,
+            count=self.MAX_MIIS * mii.Mii.MII_SIZE,
+            offset=self.MII_TABLE_OFFSET,
+        ).reshape(self.MAX_MIIS, mii.Mii.MII_SIZE)
+        records = np.frombuffer(
+            bytesData,
+            dtype=self.DTYPE,
+            count=self.MAX_MIIS,
+            offset=self.MII_TABLE_OFFSET,
+        )
+
+        # The Miis end at the first slot whose first byte is empty
+        emptySlots = np.flatnonzero(rawBytes[:, 0] == 0)
+        self.nMiis = int(emptySlots[0]) if len(emptySlots) else self.MAX_MIIS
+
+        self.rawBytes = rawBytes[: self.nMiis]
+        self.records = records[: self.nMiis]
+        self.setAll()
+
+    def setAll(self) -> None:
+        """
+        Set all the columns of the MiiTable by decoding
+        every field of every Mii in a single pass
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        self.setNames()
+        self.setCreators()
+        self.setDatesLastCrossedWith()
+        self.setSoftware()
+        self.setCountries()
+        self.setSubregions()
+        self.setNumberCrossedWith()
+        self.setStreetPassHits()
+        self.setPlazaPopulations()
+        self.setOutfits()
+        self.setPreferredPets()
+        self.setDreams()
+        self.setHobbies()
+        self.setPremium()
+        self.setMACOUIs()
+
+    @staticmethod
+    def _decodeNames(chars: np.ndarray) -> np.ndarray:
+        """
+        Decode UTF-16LE names that end with an empty character
+
+        Everything after the first empty character is discarded,
+        then the characters are widened to UCS-4 so
+        they can be viewed as NumPy strings.
+
+        Args:
+            - chars (np.ndarray): Array of shape (nMiis, 10) of UTF-16 code units
+
+        Returns:
+            - np.ndarray: Array of strings
+        """
+        valid = np.logical_and.accumulate(chars != 0, axis=1)
+        wide = np.ascontiguousarray(np.where(valid, chars, 0), dtype="<u4")
+        return wide.view(f"<U{chars.shape[1]}")[:, 0].astype(object)
+
+    @staticmethod
+    def _decodeUnique(rows: np.ndarray, decoder) -> np.ndarray:
+        """
+        Decode each distinct row only once
+
+        Useful for the columns that have few different
+        values, like the country or the software.
+
+        Args:
+            - rows (np.ndarray): Array with one row per Mii
+            - decoder (callable): Function that decodes one row
+
+        Returns:
+            - np.ndarray: Array with the decoded value of each row
+        """
+        if len(rows) == 0:
+            return np.array([], dtype=object)
+
+        uniqueRows, inverse = np.unique(rows, axis=0, return_inverse=True)
+        decoded = np.empty(len(uniqueRows), dtype=object)
+        decoded[:] = [decoder(row) for row in uniqueRows]
+        return decoded[inverse.ravel()]
+
+    def setNames(self) -> None:
+        """
+        Decode the names of all the Miis
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        self.names = self._decodeNames(self.records["name"])
+
+    def setCreators(self) -> None:
+        """
+        Decode the creator names of all the Miis
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        self.creators = self._decodeNames(self.records["creator"])
+
+    def setDatesLastCrossedWith(self) -> None:
+        """
+        Decode the dates of last crossed with of all the Miis
+
+        The 5 byte timestamps are padded to 8 bytes
+        so they can be read as unsigned integers.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        padded = np.zeros((self.nMiis, 8), dtype=np.uint8)
+        padded[:, :5] = self.records["timestamp"]
+        timestampMs = padded.view("<u8")[:, 0]
+
+        rawDatetimes = pd.to_datetime(timestampMs, unit="ms", utc=True)
+        self.datesLastCrossedWith = (
+            rawDatetimes - pd.Timedelta(days=1) + pd.DateOffset(years=30)
+        )
+
+    def setSoftware(self) -> None:
+        """
+        Decode the last software used by all the Miis
+
+        The TitleID is read as a little endian integer,
+        which is the same as reversing the bytes.
+        Each different game is only looked up once
+        and the unknown ones are searched concurrently.
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        self.gameIDs = self._decodeUnique(
+            self.records["titleID"], lambda titleID: f"{int(titleID):016X}"
+        )
+        Software.searchGames(self.gameIDs)
+        self.gameNames = self._decodeUnique(
+            self.gameIDs.astype(str), lambda gameID: Software(str(gameID)).getGameName()
+        )
+
+    def setCountries(self) -> None:
+        """
+        Decode the countries of all the Miis
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        self.countries = self._decodeUnique(
+            self.records["country"],
+            lambda row: row.tobytes().decode("utf-16le").strip("\x00"),
+        )
+
+    def setSubregions(self) -> None:
+        """
+        Decode the subregions of all the Miis
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        self.subregions = self._decodeUnique(
+            self.records["subregion"],
+            lambda row: row.tobytes().decode("utf-16le").strip("\x00"),
+        )
+
+    def setNumberCrossedWith(self) -> None:
+        """
+        Decode the number of times crossed with each Mii
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        self.nCrossedWith = self.records["nCrossedWith"].astype(np.int64)
+        for index in np.flatnonzero(self.nCrossedWith > 55):
+            print(
+                "Warning: Number of times crossed with this Mii is greater than 55. "
+                f"Check if this value is accurate. {self.names[index]} has been crossed {self.nCrossedWith[index]} times. "
+                "Please report this as an issue to the repository."
+            )
+
+    def setStreetPassHits(self) -> None:
+        """
+        Decode the number of StreetPass hits of all the Miis
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        self.streetPassHits = self.records["streetPassHits"].astype(np.int64)
+
+    def setPlazaPopulations(self) -> None:
+        """
+        Decode the plaza population of all the Miis
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        self.plazaPopulations = self.records["plazaPopulation"].astype(np.int64)
+
+    def setOutfits(self) -> None:
+        """
+        Decode the outfits of all the Miis
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        self.outfits = self._decodeUnique(
+            self.records["outfit"], lambda number: Outfit(int(number)).getOutfit()
+        )
+        for index in np.flatnonzero(self.outfits == "Unknown Outfit"):
+            print(
+                "Please, make a pull request with a single commit that adds the missing outfits."
+            )
+            print(
+                f"Name: {self.names[index]}",
+                f"Creator: {self.creators[index]}",
+                f"Outfit number: {self.records['outfit'][index]}",
+            )
+
+    def setPreferredPets(self) -> None:
+        """
+        Decode the preferred pets of all the Miis
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        self.preferredPets = self._decodeUnique(
+            self.records["preferredPet"],
+            lambda number: PreferredPet(int(number)).getPet(),
+        )
+
+    def setDreams(self) -> None:
+        """
+        Decode the dreams of all the Miis
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        self.dreams = self._decodeUnique(
+            self.records["dream"], lambda number: Dream(int(number)).getDream()
+        )
+
+    def setHobbies(self) -> None:
+        """
+        Decode the hobbies of all the Miis
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        self.hobbies = self._decodeUnique(
+            self.records["hobby"], lambda number: Hobby(int(number)).getHobby()
+        )
+
+    def setPremium(self) -> None:
+        """
+        Decode the premium status of all the Miis
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        self.premium = (self.records["premium"] & 1).astype(bool)
+
+    def setMACOUIs(self) -> None:
+        """
+        Decode the MAC OUI of all the Miis
+
+        Args:
+            - None
+
+        Returns:
+            - None
+        """
+        oui = self.records["macOUI"]
+        self.macOUIs = (
+            self.HEX[oui[:, 0]] + ":" + self.HEX[oui[:, 1]] + ":" + self.HEX[oui[:, 2]]
+        )
+
+    def getData(self) -> pd.DataFrame:
+        """
+        Get the data of all the Miis as a pandas DataFrame
+
+        It has the same columns as Mii.getData().
+
+        Args:
+            - None
+
+        Returns:
+            - pd.DataFrame: DataFrame containing the data of all the Miis
+        """
+        return pd.DataFrame(
+            {
+                "Name": self.names,
+                "Creator": self.creators,
+                "DateLastCrossedWith": self.datesLastCrossedWith,
+                "GameID": self.gameIDs,
+                "GameName": self.gameNames,
+                "Country": self.countries,
+                "Subregion": self.subregions,
+                "NumberCrossedWith": self.nCrossedWith,
+                "StreetPassHits": self.streetPassHits,
+                "PlazaPopulation": self.plazaPopulations,
+                "PreferredPet": self.preferredPets,
+                "Outfit": self.outfits,
+                "Dream": self.dreams,
+                "Hobby": self.hobbies,
+                "Premium": self.premium,
+                "MAC_OUI": self.macOUIs,
+            }
+        )